@@ -1,4 +1,5 @@
-import { ApolloClient, InMemoryCache } from "@apollo/client";
+import { ApolloClient, HttpLink, InMemoryCache } from "@apollo/client";
+import { createPersistedQueryLink } from "@apollo/client/link/persisted-queries";
 import { LocalStorageWrapper, persistCache } from "apollo3-cache-persist";
 
 const cache = new InMemoryCache();
@@ -8,9 +9,24 @@ persistCache({
   storage: new LocalStorageWrapper(window.localStorage),
 });
 
+const sha256 = async (query: string) => {
+  const digest = await crypto.subtle.digest("SHA-256", new TextEncoder().encode(query));
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, "0"))
+    .join("");
+};
+
+// GET queries can be revalidated by the browser with the ETag of the response
+const httpLink = new HttpLink({ uri: "/api/", useGETForQueries: true });
+
+// crypto.subtle exists only in secure contexts, the app served over plain HTTP sends the whole queries
+const link = window.crypto?.subtle
+  ? createPersistedQueryLink({ sha256, useGETForHashedQueries: true }).concat(httpLink)
+  : httpLink;
+
 export const client = new ApolloClient({
   cache,
-  uri: "/api/",
+  link,
   queryDeduplication: false,
   defaultOptions: {
     watchQuery: {
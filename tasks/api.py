@@ -10,6 +10,22 @@ def generate_graphql_schema(c):
     generate_graphql_schema()
 
 
+@task
+def register_persisted_queries(c):
+    """Register the operations of the frontend as persisted queries"""
+    from yggdrasil.components.folders import Folders
+    from yggdrasil.components.persisted_queries import PersistedQueryStore, get_client_documents
+    from .redis_ import get_redis_client
+
+    redis_client = get_redis_client()
+
+    documents = get_client_documents((Folders.frontend / "src" / "queries.graphql").read_text())
+    for name, document in documents.items():
+        query_hash = PersistedQueryStore.get_hash(document)
+        redis_client.set(PersistedQueryStore.get_key(query_hash), document)
+        print(f"{name}: {query_hash}")
+
+
 @task
 def start(c, port=6000, reload=True):
     """Run the API server with uvicorn"""
@@ -28,3 +44,27 @@ def start(c, port=6000, reload=True):
         commands.append("--reload")
 
     c.run(join(commands))
+
+
+@task
+def benchmark_startup(c, iterations=20):
+    """Measure the import time of the API and the time of building its schema"""
+    from time import perf_counter
+
+    start = perf_counter()
+    from yggdrasil.api.schema import create_api_schema
+    from yggdrasil.components.graphene.pydantic import clear_type_registry, object_type_from_pydantic
+    from yggdrasil.schema import BoardSection
+
+    print(f"import: {(perf_counter() - start) * 1000:.1f} ms")
+
+    start = perf_counter()
+    for _ in range(iterations):
+        create_api_schema()
+    print(f"schema: {(perf_counter() - start) * 1000 / iterations:.2f} ms")
+
+    start = perf_counter()
+    for _ in range(iterations):
+        clear_type_registry()
+        object_type_from_pydantic(BoardSection)
+    print(f"type conversion: {(perf_counter() - start) * 1000 / iterations:.2f} ms")
@@ -49,8 +49,9 @@ def delete(c, key):
 def show(c, key):
     """View redis value by a key name"""
     import json
+    from yggdrasil.components import cache_codec
 
     redis_client = get_redis_client()
 
     data = redis_client.get(key)
-    print(json.dumps(json.loads(data), indent=2))
+    print(json.dumps(cache_codec.decode(data), indent=2))
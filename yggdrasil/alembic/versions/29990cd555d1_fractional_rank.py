@@ -0,0 +1,49 @@
+"""fractional rank
+
+Revision ID: 29990cd555d1
+Revises: 72a0fae491b6
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "29990cd555d1"
+down_revision: Union[str, None] = "72a0fae491b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the integer ranks are valid fractional ranks as they are
+    op.alter_column("section", "rank", type_=sa.Float(), existing_nullable=True)
+    op.alter_column("link", "rank", type_=sa.Float(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    # the fractions are renumbered to their position in the list
+    op.execute(
+        """
+        UPDATE section SET rank = numbered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY user_id ORDER BY rank, id) - 1 AS position FROM section
+        ) numbered
+        WHERE section.id = numbered.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE link SET rank = numbered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY section_id, link_group_id ORDER BY rank, id) - 1 AS position
+            FROM link
+        ) numbered
+        WHERE link.id = numbered.id
+        """
+    )
+    op.alter_column("section", "rank", type_=sa.Integer(), existing_nullable=True, postgresql_using="rank::integer")
+    op.alter_column("link", "rank", type_=sa.Integer(), existing_nullable=True, postgresql_using="rank::integer")
@@ -0,0 +1,57 @@
+"""add indexes
+
+Revision ID: 53b7f263dd66
+Revises: 29990cd555d1
+Create Date: 2026-10-18 14:40:12.581903
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "53b7f263dd66"
+down_revision: Union[str, None] = "29990cd555d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # nothing kept concurrent first logins from storing a sub more than once, and the unique index fails on such rows.
+    # The users of a sub are merged: the first one is kept, and the sections of the others are moved after its own.
+    op.execute(
+        """
+        UPDATE section SET user_id = moved.kept_user_id, rank = moved.rank
+        FROM (
+            SELECT
+                section.id,
+                duplicate.kept_user_id,
+                coalesce((SELECT max(rank) FROM section kept WHERE kept.user_id = duplicate.kept_user_id), -1)
+                    + row_number() OVER (
+                        PARTITION BY duplicate.kept_user_id ORDER BY section.user_id, section.rank, section.id
+                    ) AS rank
+            FROM section
+            JOIN (
+                SELECT id, min(id) OVER (PARTITION BY sub) AS kept_user_id FROM "user" WHERE sub IS NOT NULL
+            ) duplicate ON duplicate.id = section.user_id
+            WHERE duplicate.id != duplicate.kept_user_id
+        ) moved
+        WHERE section.id = moved.id
+        """
+    )
+    op.execute('DELETE FROM "user" WHERE id != (SELECT min(id) FROM "user" same_sub WHERE same_sub.sub = "user".sub)')
+    # the logins look up the user by sub
+    op.create_index("ix_user_sub", "user", ["sub"], unique=True)
+    # the lists are filtered by their owner and ordered by rank
+    op.create_index("ix_section_user_id_rank", "section", ["user_id", "rank"])
+    op.create_index("ix_link_section_id_rank", "link", ["section_id", "rank"])
+    # the links of a group, also used by the cascade delete of the group
+    op.create_index("ix_link_link_group_id", "link", ["link_group_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_link_link_group_id", table_name="link")
+    op.drop_index("ix_link_section_id_rank", table_name="link")
+    op.drop_index("ix_section_user_id_rank", table_name="section")
+    op.drop_index("ix_user_sub", table_name="user")
@@ -0,0 +1,11 @@
+from yggdrasil.components.graphene.node_base import NodeBase
+from yggdrasil.schema import BoardEvent
+
+
+def get_board_channel(user_id: int) -> str:
+    return f"board-events:{user_id}"
+
+
+def publish_board_event(node: NodeBase, event: BoardEvent):
+    """Notify the open boards of the user about a committed change, once the node is resolved"""
+    node.publish_event(get_board_channel(node.user_info.id), event)
@@ -2,6 +2,8 @@ from graphene import ObjectType
 
 from yggdrasil.api.nodes.delete_link import DeleteLinkNode
 from yggdrasil.api.nodes.delete_section import DeleteSectionNode
+from yggdrasil.api.nodes.move_link import MoveLinkNode
+from yggdrasil.api.nodes.move_section import MoveSectionNode
 from yggdrasil.api.nodes.save_board_settings import SaveBoardSettingsNode
 from yggdrasil.api.nodes.save_link import SaveLinkNode
 from yggdrasil.api.nodes.save_links_ranks import SaveLinksRanksNode
@@ -19,4 +21,7 @@ class Mutation(ObjectType):
     save_sections_ranks = SaveSectionsRanksNode.field()
     save_links_ranks = SaveLinksRanksNode.field()
 
+    move_section = MoveSectionNode.field()
+    move_link = MoveLinkNode.field()
+
     save_board_settings = SaveBoardSettingsNode.field()
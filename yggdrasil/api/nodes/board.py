@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from graphene import List, NonNull
+from sqlalchemy import select
+
+from yggdrasil.api.types import CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, CacheScope
+from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
+from yggdrasil.db_tables import link, section
+from yggdrasil.schema import BoardLink, BoardSection
+
+
+class BoardNode(NodeBase):
+    config = NodeConfig(
+        result_type=List(NonNull(object_type_from_pydantic(BoardSection))),
+        description="The sections of the user with their links, and the links of the link groups",
+        cache_expiry_time=timedelta(hours=1),
+        cache_scope=CacheScope.USER,
+        cache_tags={CacheTag.SECTIONS, CacheTag.LINKS},
+        # every section and link of the user in one query
+        cost=5,
+        field_extra={"required": True},
+    )
+
+    async def resolve(self):
+        # the links of the sections and of the link groups are backed by the same columns, the fields of the sections
+        # are not link columns
+        field_columns = {name: [] for name in BoardSection.model_fields}
+        for prefix in ["links.", "links.links."]:
+            field_columns.update({f"{prefix}{column.name}": [column.name] for column in link.c})
+        link_columns = self.get_selected_columns(link, field_columns, required=["id", "section_id", "link_group_id"])
+
+        query = (
+            select(
+                *[column.label(f"section_{column.name}") for column in section.c],
+                *[column.label(f"link_{column.name}") for column in link_columns],
+            )
+            .select_from(section.outerjoin(link, link.c.section_id == section.c.id))
+            .where(section.c.user_id == self.user_info.id)
+            .order_by(section.c.rank, link.c.rank)
+        )
+
+        result = await self.db_session.execute(query)
+
+        sections: dict[int, BoardSection] = {}
+        links: list[BoardLink] = []
+        for row in result.mappings():
+            if row["section_id"] not in sections:
+                sections[row["section_id"]] = BoardSection.model_construct(
+                    id=row["section_id"], name=row["section_name"], rank=row["section_rank"]
+                )
+            if row["link_id"] is not None:
+                links.append(
+                    BoardLink.model_construct(**{column.name: row[f"link_{column.name}"] for column in link_columns})
+                )
+
+        links_by_id = {board_link.id: board_link for board_link in links}
+        for board_link in links:
+            if board_link.link_group_id is None:
+                sections[board_link.section_id].links.append(board_link)
+            elif group := links_by_id.get(board_link.link_group_id):
+                group.links.append(board_link)
+
+        return list(sections.values())
@@ -1,6 +1,9 @@
+from datetime import timedelta
+
 from sqlalchemy import select
 
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig
+from yggdrasil.api.types import CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
 from yggdrasil.db_tables import user
 from yggdrasil.schema import BoardSettings, BoardBackground
@@ -9,16 +12,23 @@ from yggdrasil.schema import BoardSettings, BoardBackground
 class BoardSettingsNode(NodeBase):
     config = NodeConfig(
         result_type=object_type_from_pydantic(BoardSettings),
+        cache_expiry_time=timedelta(hours=1),
+        cache_scope=CacheScope.USER,
+        cache_tags={CacheTag.BOARD_SETTINGS},
     )
 
     async def resolve(self):
         if self.user_info is None:
             return None
 
-        query = select(user).where(user.c.id == self.user_info.id)
-        query_result = await self.db_session.execute(query)
-        user_data = query_result.first()
+        field_columns = {"background.type": ["board_background_type"], "background.value": ["board_background_value"]}
+        columns = self.get_selected_columns(user, field_columns, required=[])
 
-        bg_data = BoardBackground(type=user_data.board_background_type, value=user_data.board_background_value)
+        background = {}
+        if columns:
+            query = select(*columns).where(user.c.id == self.user_info.id)
+            user_data = (await self.db_session.execute(query)).mappings().first()
+            background = {column.name.removeprefix("board_background_"): user_data[column.name] for column in columns}
 
-        return BoardSettings(background=bg_data)
+        # only the requested fields are set
+        return BoardSettings.model_construct(background=BoardBackground.model_construct(**background))
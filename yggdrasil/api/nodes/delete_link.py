@@ -1,10 +1,12 @@
 from pydantic import BaseModel
 from sqlalchemy import delete, func, select
 
-from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
 from yggdrasil.db_tables import link, section
+from yggdrasil.schema import BoardEvent, BoardEventType
 
 
 class DeleteLinkValidator(BaseModel):
@@ -15,6 +17,8 @@ class DeleteLinkNode(NodeBase[DeleteLinkValidator]):
     config = NodeConfig(
         result_type=object_type_from_pydantic(CommonMutationResult),
         input_validator=DeleteLinkValidator,
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.LINKS},
     )
 
     async def validate(self):
@@ -36,4 +40,6 @@ class DeleteLinkNode(NodeBase[DeleteLinkValidator]):
         await self.db_session.execute(query)
         await self.db_session.commit()
 
+        publish_board_event(self, BoardEvent(type=BoardEventType.LINK_DELETED, ids=[self.args.id]))
+
         return CommonMutationResult()
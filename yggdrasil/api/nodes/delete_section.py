@@ -1,10 +1,12 @@
 from pydantic import BaseModel
 from sqlalchemy import delete, select, func
 
-from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
 from yggdrasil.db_tables import section
+from yggdrasil.schema import BoardEvent, BoardEventType
 
 
 class DeleteSectionValidator(BaseModel):
@@ -15,6 +17,8 @@ class DeleteSectionNode(NodeBase[DeleteSectionValidator]):
     config = NodeConfig(
         result_type=object_type_from_pydantic(CommonMutationResult),
         input_validator=DeleteSectionValidator,
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.SECTIONS, CacheTag.LINKS},
     )
 
     async def validate(self):
@@ -35,4 +39,6 @@ class DeleteSectionNode(NodeBase[DeleteSectionValidator]):
         await self.db_session.execute(query)
         await self.db_session.commit()
 
+        publish_board_event(self, BoardEvent(type=BoardEventType.SECTION_DELETED, ids=[self.args.id]))
+
         return CommonMutationResult()
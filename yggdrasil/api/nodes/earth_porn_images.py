@@ -10,6 +10,10 @@ class EarthPornImagesNode(NodeBase):
     config = NodeConfig(
         result_type=List(NonNull(object_type_from_pydantic(EarthPornImage))),
         cache_expiry_time=timedelta(hours=24),
+        cache_stale_time=timedelta(hours=1),
+        cache_single_flight=True,
+        # fetched from reddit when not cached
+        cost=10,
     )
 
     async def resolve(self):
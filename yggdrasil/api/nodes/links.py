@@ -1,13 +1,38 @@
+from datetime import timedelta
+
 from graphene import List, NonNull
 from pydantic import BaseModel
 from sqlalchemy import select
 
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig
+from yggdrasil.api.types import CacheTag
+from yggdrasil.components.graphene.dataloader import DataLoader
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
 from yggdrasil.db_tables import link, section
 from yggdrasil.schema import Link
 
 
+class LinksBySectionLoader(DataLoader[tuple[int, tuple[str, ...]], list]):
+    """Loads the links of the sections, the keys are the section id and the names of the columns to select"""
+
+    async def batch_load(self, keys: list[tuple[int, tuple[str, ...]]]) -> list[list]:
+        section_ids = {section_id for section_id, _ in keys}
+        column_names = {"section_id"}.union(*[names for _, names in keys])
+
+        query = (
+            select(*[column for column in link.c if column.name in column_names])
+            .join(section, section.c.id == link.c.section_id)
+            .where(section.c.user_id == self.user_info.id, link.c.section_id.in_(section_ids))
+            .order_by(link.c.rank)
+        )
+
+        links = {section_id: [] for section_id in section_ids}
+        for row in (await self.db_session.execute(query)).all():
+            links[row.section_id].append(row)
+
+        return [links[section_id] for section_id, _ in keys]
+
+
 class LinksValidator(BaseModel):
     section_id: int = None
 
@@ -16,18 +41,26 @@ class LinksNode(NodeBase[LinksValidator]):
     config = NodeConfig(
         result_type=List(NonNull(object_type_from_pydantic(Link))),
         input_validator=LinksValidator,
+        cache_expiry_time=timedelta(hours=1),
+        cache_scope=CacheScope.USER,
+        cache_tags={CacheTag.LINKS},
+        cost=2,
         field_extra={"required": True},
     )
 
     async def resolve(self):
-        query = (
-            select(link).join(section, section.c.id == link.c.section_id).where(section.c.user_id == self.user_info.id)
-        )
+        columns = self.get_selected_columns(link)
 
         if self.args.section_id is not None:
-            query = query.where(link.c.section_id == self.args.section_id)
+            key = (self.args.section_id, tuple(column.name for column in columns))
+            return await LinksBySectionLoader.get(self._info).load(key)
 
-        query = query.order_by(section.c.rank, link.c.rank)
+        query = (
+            select(*columns)
+            .join(section, section.c.id == link.c.section_id)
+            .where(section.c.user_id == self.user_info.id)
+            .order_by(section.c.rank, link.c.rank)
+        )
 
         result = await self.db_session.execute(query)
 
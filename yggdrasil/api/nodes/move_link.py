@@ -0,0 +1,84 @@
+from pydantic import BaseModel
+from sqlalchemy import select, update
+
+from yggdrasil import schema
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.ranks import LINK_LIST_COLUMNS, get_rank_between_items, is_next_to_list_end
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError, CacheScope
+from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
+from yggdrasil.db_tables import link, section
+from yggdrasil.schema import BoardEvent, BoardEventType
+
+
+class MoveLinkValidator(BaseModel):
+    id: int
+    before_id: int = None
+    after_id: int = None
+
+
+class MoveLinkNode(NodeBase[MoveLinkValidator]):
+    config = NodeConfig(
+        result_type=object_type_from_pydantic(CommonMutationResult),
+        input_validator=MoveLinkValidator,
+        description=(
+            "Move the link between beforeId, the link preceding it, and afterId, the link following it. Only afterId "
+            "is given to move it to the start of the list, only beforeId to move it to the end"
+        ),
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.LINKS},
+    )
+
+    async def validate(self):
+        if self.user_info is None:
+            raise NodeValidationError(CommonMutationResult(errors=[get_auth_error()]))
+
+        ids = [id_ for id_ in [self.args.id, self.args.before_id, self.args.after_id] if id_ is not None]
+        if len(set(ids)) != len(ids):
+            raise NodeValidationError(CommonMutationResult(errors=[Error(msg="The ids must be different")]))
+
+        query = (
+            select(link.c.id, link.c.section_id, link.c.link_group_id, link.c.rank)
+            .join(section, section.c.id == link.c.section_id)
+            .where(link.c.id.in_(ids), section.c.user_id == self.user_info.id)
+        )
+        links = {row.id: row for row in await self.db_session.execute(query)}
+
+        if unknown_ids := set(ids) - links.keys():
+            raise NodeValidationError(CommonMutationResult(errors=[Error(msg=f"Unknown ids: {list(unknown_ids)}")]))
+
+        moved = links[self.args.id]
+        if any(
+            (row.section_id, row.link_group_id) != (moved.section_id, moved.link_group_id) for row in links.values()
+        ):
+            raise NodeValidationError(CommonMutationResult(errors=[Error(msg="The links must be in the same list")]))
+
+        if self.args.before_id is not None and self.args.after_id is not None:
+            if links[self.args.before_id].rank >= links[self.args.after_id].rank:
+                raise NodeValidationError(CommonMutationResult(errors=[Error(msg="The links are in the wrong order")]))
+
+        if not await is_next_to_list_end(
+            self.db_session, link, LINK_LIST_COLUMNS, self.args.id, self.args.before_id, self.args.after_id
+        ):
+            if len(ids) == 1:
+                raise NodeValidationError(CommonMutationResult(errors=[Error(msg="beforeId or afterId is required")]))
+            raise NodeValidationError(
+                CommonMutationResult(errors=[Error(msg="The link must be moved next to the first or the last link")])
+            )
+
+    async def resolve(self):
+        rank, renumbered_ids = await get_rank_between_items(
+            self.db_session, link, LINK_LIST_COLUMNS, self.args.before_id, self.args.after_id
+        )
+
+        query = update(link).where(link.c.id == self.args.id).values(rank=rank).returning(*link.c)
+        moved_link = (await self.db_session.execute(query)).one()
+        await self.db_session.commit()
+
+        if renumbered_ids is not None:
+            publish_board_event(self, BoardEvent(type=BoardEventType.LINKS_RANKED, ids=renumbered_ids))
+        publish_board_event(
+            self, BoardEvent(type=BoardEventType.LINK_SAVED, link=schema.Link.model_validate(moved_link._mapping))
+        )
+
+        return CommonMutationResult()
@@ -0,0 +1,88 @@
+from pydantic import BaseModel
+from sqlalchemy import select, update
+
+from yggdrasil import schema
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.ranks import SECTION_LIST_COLUMNS, get_rank_between_items, is_next_to_list_end
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError, CacheScope
+from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
+from yggdrasil.db_tables import section
+from yggdrasil.schema import BoardEvent, BoardEventType
+
+
+class MoveSectionValidator(BaseModel):
+    id: int
+    before_id: int = None
+    after_id: int = None
+
+
+class MoveSectionNode(NodeBase[MoveSectionValidator]):
+    config = NodeConfig(
+        result_type=object_type_from_pydantic(CommonMutationResult),
+        input_validator=MoveSectionValidator,
+        description=(
+            "Move the section between beforeId, the section preceding it, and afterId, the section following it. Only "
+            "afterId is given to move it to the start of the list, only beforeId to move it to the end"
+        ),
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.SECTIONS, CacheTag.LINKS},
+    )
+
+    async def validate(self):
+        if self.user_info is None:
+            raise NodeValidationError(CommonMutationResult(errors=[get_auth_error()]))
+
+        ids = [id_ for id_ in [self.args.id, self.args.before_id, self.args.after_id] if id_ is not None]
+        if len(set(ids)) != len(ids):
+            raise NodeValidationError(CommonMutationResult(errors=[Error(msg="The ids must be different")]))
+
+        query = select(section.c.id, section.c.rank).where(
+            section.c.id.in_(ids), section.c.user_id == self.user_info.id
+        )
+        ranks = {row.id: row.rank for row in await self.db_session.execute(query)}
+
+        if unknown_ids := set(ids) - ranks.keys():
+            raise NodeValidationError(CommonMutationResult(errors=[Error(msg=f"Unknown ids: {list(unknown_ids)}")]))
+
+        if self.args.before_id is not None and self.args.after_id is not None:
+            if ranks[self.args.before_id] >= ranks[self.args.after_id]:
+                raise NodeValidationError(
+                    CommonMutationResult(errors=[Error(msg="The sections are in the wrong order")])
+                )
+
+        if not await is_next_to_list_end(
+            self.db_session, section, SECTION_LIST_COLUMNS, self.args.id, self.args.before_id, self.args.after_id
+        ):
+            if len(ids) == 1:
+                raise NodeValidationError(CommonMutationResult(errors=[Error(msg="beforeId or afterId is required")]))
+            raise NodeValidationError(
+                CommonMutationResult(
+                    errors=[Error(msg="The section must be moved next to the first or the last section")]
+                )
+            )
+
+    async def resolve(self):
+        rank, renumbered_ids = await get_rank_between_items(
+            self.db_session, section, SECTION_LIST_COLUMNS, self.args.before_id, self.args.after_id
+        )
+
+        query = (
+            update(section)
+            .where(section.c.id == self.args.id)
+            .values(rank=rank)
+            .returning(section.c.id, section.c.name, section.c.rank)
+        )
+        moved_section = (await self.db_session.execute(query)).one()
+        await self.db_session.commit()
+
+        if renumbered_ids is not None:
+            publish_board_event(self, BoardEvent(type=BoardEventType.SECTIONS_RANKED, ids=renumbered_ids))
+        publish_board_event(
+            self,
+            BoardEvent(
+                type=BoardEventType.SECTION_SAVED, section=schema.Section.model_validate(moved_section._mapping)
+            ),
+        )
+
+        return CommonMutationResult()
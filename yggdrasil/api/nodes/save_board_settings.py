@@ -1,11 +1,12 @@
 from pydantic import BaseModel
 from sqlalchemy import update
 
-from yggdrasil.api.types import CommonMutationResult, get_auth_error
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
 from yggdrasil.db_tables import user
-from yggdrasil.schema import BoardSettings
+from yggdrasil.schema import BoardEvent, BoardEventType, BoardSettings
 
 
 class SaveBoardSettingsValidator(BaseModel):
@@ -16,6 +17,8 @@ class SaveBoardSettingsNode(NodeBase[SaveBoardSettingsValidator]):
     config = NodeConfig(
         result_type=object_type_from_pydantic(CommonMutationResult),
         input_validator=SaveBoardSettingsValidator,
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.BOARD_SETTINGS},
     )
 
     async def validate(self):
@@ -36,4 +39,8 @@ class SaveBoardSettingsNode(NodeBase[SaveBoardSettingsValidator]):
         await self.db_session.execute(query)
         await self.db_session.commit()
 
+        publish_board_event(
+            self, BoardEvent(type=BoardEventType.BOARD_SETTINGS_SAVED, board_settings=self.args.board_settings)
+        )
+
         return CommonMutationResult()
@@ -1,15 +1,16 @@
-from asyncio import gather
 from typing import Annotated
 
 from pydantic import BaseModel, HttpUrl, StringConstraints, ValidationError, field_validator
 from pydantic_core.core_schema import FieldValidationInfo
 from sqlalchemy import insert, update, select, func
 
-from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error
-from yggdrasil.components.graphene.node_base import NodeConfig, NodeValidationError, NodeBase
+from yggdrasil import schema
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeConfig, NodeValidationError, NodeBase, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
 from yggdrasil.db_tables import link, section
-from yggdrasil.schema import LinkType
+from yggdrasil.schema import BoardEvent, BoardEventType, LinkType
 
 
 class Link(BaseModel):
@@ -19,7 +20,7 @@ class Link(BaseModel):
     url: HttpUrl | None = None
     favicon: str | None = None
     section_id: int
-    rank: int
+    rank: float
     link_group_id: int | None = None
 
     @field_validator("url")
@@ -49,6 +50,8 @@ class SaveLinkNode(NodeBase[SaveLinkValidator]):
     config = NodeConfig(
         result_type=object_type_from_pydantic(CommonMutationResult),
         input_validator=SaveLinkValidator,
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.LINKS},
     )
 
     async def validate(self):
@@ -85,21 +88,24 @@ class SaveLinkNode(NodeBase[SaveLinkValidator]):
 
     async def resolve(self):
         link_data = self.args.link.model_dump(exclude_unset=True, mode="json")
-        queries = []
 
         if self.args.link.id is None:
-            queries.append(insert(link).values(link_data))
+            query = insert(link).values(link_data)
         else:
             if await self._get_current_section_id() != self.args.link.section_id:
-                queries.append(
+                await self.db_session.execute(
                     update(link)
                     .where(link.c.link_group_id == self.args.link.id)
                     .values({"section_id": self.args.link.section_id})
                 )
 
-            queries.append(update(link).where(link.c.id == self.args.link.id).values(link_data))
+            query = update(link).where(link.c.id == self.args.link.id).values(link_data)
 
-        await gather(*[self.db_session.execute(query) for query in queries])
+        saved_link = (await self.db_session.execute(query.returning(*link.c))).one()
         await self.db_session.commit()
 
+        publish_board_event(
+            self, BoardEvent(type=BoardEventType.LINK_SAVED, link=schema.Link.model_validate(saved_link._mapping))
+        )
+
         return CommonMutationResult()
@@ -1,10 +1,13 @@
 from pydantic import BaseModel
-from sqlalchemy import update, select, func
+from sqlalchemy import select, func
 
-from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
+from yggdrasil.components.ranking import get_ranks_update_query
 from yggdrasil.db_tables import link, section
+from yggdrasil.schema import BoardEvent, BoardEventType
 
 
 class SaveLinksRanksValidator(BaseModel):
@@ -15,6 +18,8 @@ class SaveLinksRanksNode(NodeBase[SaveLinksRanksValidator]):
     config = NodeConfig(
         result_type=object_type_from_pydantic(CommonMutationResult),
         input_validator=SaveLinksRanksValidator,
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.LINKS},
     )
 
     async def validate(self):
@@ -37,8 +42,9 @@ class SaveLinksRanksNode(NodeBase[SaveLinksRanksValidator]):
             raise NodeValidationError(CommonMutationResult(errors=[Error(msg=f"Unknown ids: {list(unknown_ids)}")]))
 
     async def resolve(self):
-        for index, link_id in enumerate(self.args.link_ids):
-            await self.db_session.execute(update(link).where(link.c.id == link_id).values({"rank": index}))
+        await self.db_session.execute(get_ranks_update_query(link, self.args.link_ids))
         await self.db_session.commit()
 
+        publish_board_event(self, BoardEvent(type=BoardEventType.LINKS_RANKED, ids=self.args.link_ids))
+
         return CommonMutationResult()
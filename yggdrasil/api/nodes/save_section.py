@@ -1,16 +1,19 @@
 from pydantic import BaseModel
 from sqlalchemy import insert, update, select, func
 
-from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError
+from yggdrasil import schema
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
 from yggdrasil.db_tables import section
+from yggdrasil.schema import BoardEvent, BoardEventType
 
 
 class Section(BaseModel):
     id: int = None
     name: str
-    rank: int
+    rank: float
 
 
 class SaveSectionValidator(BaseModel):
@@ -21,6 +24,8 @@ class SaveSectionNode(NodeBase[SaveSectionValidator]):
     config = NodeConfig(
         result_type=object_type_from_pydantic(CommonMutationResult),
         input_validator=SaveSectionValidator,
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.SECTIONS, CacheTag.LINKS},
     )
 
     async def validate(self):
@@ -46,7 +51,16 @@ class SaveSectionNode(NodeBase[SaveSectionValidator]):
         else:
             query = update(section).where(section.c.id == self.args.section.id).values(section_data)
 
-        await self.db_session.execute(query)
+        saved_section = (
+            await self.db_session.execute(query.returning(section.c.id, section.c.name, section.c.rank))
+        ).one()
         await self.db_session.commit()
 
+        publish_board_event(
+            self,
+            BoardEvent(
+                type=BoardEventType.SECTION_SAVED, section=schema.Section.model_validate(saved_section._mapping)
+            ),
+        )
+
         return CommonMutationResult()
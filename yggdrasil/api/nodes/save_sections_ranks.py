@@ -1,10 +1,13 @@
 from pydantic import BaseModel
-from sqlalchemy import update, select
+from sqlalchemy import select
 
-from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError
+from yggdrasil.api.events import publish_board_event
+from yggdrasil.api.types import CommonMutationResult, get_auth_error, Error, CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, NodeValidationError, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
+from yggdrasil.components.ranking import get_ranks_update_query
 from yggdrasil.db_tables import section
+from yggdrasil.schema import BoardEvent, BoardEventType
 
 
 class SaveSectionsRanksValidator(BaseModel):
@@ -15,6 +18,8 @@ class SaveSectionsRanksNode(NodeBase[SaveSectionsRanksValidator]):
     config = NodeConfig(
         result_type=object_type_from_pydantic(CommonMutationResult),
         input_validator=SaveSectionsRanksValidator,
+        cache_scope=CacheScope.USER,
+        invalidates_cache_tags={CacheTag.SECTIONS, CacheTag.LINKS},
     )
 
     async def validate(self):
@@ -36,8 +41,9 @@ class SaveSectionsRanksNode(NodeBase[SaveSectionsRanksValidator]):
             raise NodeValidationError(CommonMutationResult(errors=[Error(msg=f"Unknown ids: {list(unknown_ids)}")]))
 
     async def resolve(self):
-        for index, section_id in enumerate(self.args.section_ids):
-            await self.db_session.execute(update(section).where(section.c.id == section_id).values({"rank": index}))
+        await self.db_session.execute(get_ranks_update_query(section, self.args.section_ids))
         await self.db_session.commit()
 
+        publish_board_event(self, BoardEvent(type=BoardEventType.SECTIONS_RANKED, ids=self.args.section_ids))
+
         return CommonMutationResult()
@@ -1,7 +1,10 @@
+from datetime import timedelta
+
 from graphene import List, NonNull
 from sqlalchemy import select
 
-from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig
+from yggdrasil.api.types import CacheTag
+from yggdrasil.components.graphene.node_base import NodeBase, NodeConfig, CacheScope
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
 from yggdrasil.db_tables import section
 from yggdrasil.schema import Section
@@ -10,6 +13,10 @@ from yggdrasil.schema import Section
 class SectionsNode(NodeBase):
     config = NodeConfig(
         result_type=List(NonNull(object_type_from_pydantic(Section))),
+        cache_expiry_time=timedelta(hours=1),
+        cache_scope=CacheScope.USER,
+        cache_tags={CacheTag.SECTIONS},
+        cost=2,
         field_extra={"required": True},
     )
 
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from functools import partial
+
+from graphene import Schema
+from starlette.requests import Request
+
+from yggdrasil.api.nodes.earth_porn_images import EarthPornImagesNode
+from yggdrasil.components.cache import RequestCache
+from yggdrasil.components.database import LazySession
+from yggdrasil.components.request_context import RequestContext
+from yggdrasil.components.scheduler import Scheduler
+from yggdrasil.components.types import RequestScopeKeys
+
+EARTH_PORN_IMAGES_QUERY = """
+query EarthPornImages {
+    earthPornImages {
+        id
+        url
+        title
+    }
+}
+"""
+
+
+async def refresh_query(schema: Schema, request_context: RequestContext, query: str):
+    request_cache = RequestCache(request_context.cache)
+    database_session = LazySession(request_context.db)
+    request = Request(
+        {
+            "type": "http",
+            "session": {},
+            RequestScopeKeys.CONTEXT: request_context,
+            RequestScopeKeys.DATABASE_SESSION: database_session,
+            RequestScopeKeys.CACHE_REFRESH: True,
+            RequestScopeKeys.REQUEST_CACHE: request_cache,
+        }
+    )
+    try:
+        result = await schema.execute_async(query, context_value={"request": request})
+    finally:
+        await database_session.close()
+
+    await request_cache.flush()
+
+    if result.errors:
+        raise result.errors[0]
+
+
+def register_prewarm_jobs(scheduler: Scheduler, schema: Schema, request_context: RequestContext):
+    earth_porn_images_expiry = EarthPornImagesNode.config.cache_expiry_time
+    scheduler.add_job(
+        "earthPornImages",
+        partial(refresh_query, schema, request_context, EARTH_PORN_IMAGES_QUERY),
+        interval=earth_porn_images_expiry - timedelta(hours=1),
+        jitter=timedelta(minutes=10),
+    )
@@ -0,0 +1,112 @@
+import logging
+from datetime import timedelta
+from functools import partial
+
+from redis.exceptions import RedisError
+from sqlalchemy import Column, ColumnElement, Table, and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yggdrasil.api.types import CacheTag
+from yggdrasil.components.cache import Cache, GENERATION_TAG, get_tag_key, get_user_scope_key
+from yggdrasil.components.database import Database
+from yggdrasil.components.ranking import get_rank_between, get_rebalance_query
+from yggdrasil.components.scheduler import Scheduler
+from yggdrasil.db_tables import link, section
+
+logger = logging.getLogger(__name__)
+
+SECTION_LIST_COLUMNS = [section.c.user_id]
+LINK_LIST_COLUMNS = [link.c.section_id, link.c.link_group_id]
+
+
+async def get_ranks(session: AsyncSession, table: Table, ids: list[int | None]) -> dict[int, float]:
+    ids = [id_ for id_ in ids if id_ is not None]
+    if not ids:
+        return {}
+    rows = await session.execute(select(table.c.id, table.c.rank).where(table.c.id.in_(ids)))
+    return {row.id: row.rank for row in rows}
+
+
+def _same_list_as(table: Table, list_columns: list[Column], item_id: int) -> ColumnElement:
+    item = table.alias("item")
+    return and_(
+        *[
+            column.is_not_distinct_from(select(item.c[column.name]).where(item.c.id == item_id).scalar_subquery())
+            for column in list_columns
+        ]
+    )
+
+
+async def is_next_to_list_end(
+    session: AsyncSession, table: Table, list_columns: list[Column], item_id: int, before_id: int, after_id: int
+) -> bool:
+    """An item moved with one neighbour only goes to an end of the list, so that neighbour must be the first or the
+    last of the other items. An item moved without neighbours must be alone in its list."""
+    if before_id is not None and after_id is not None:
+        return True
+
+    neighbour_ids = [id_ for id_ in [before_id, after_id] if id_ is not None]
+    query = (
+        select(func.count())
+        .select_from(table)
+        .where(_same_list_as(table, list_columns, item_id), table.c.id.not_in([item_id, *neighbour_ids]))
+    )
+    if neighbour_ids:
+        neighbour_rank = select(table.c.rank).where(table.c.id == neighbour_ids[0]).scalar_subquery()
+        query = query.where(table.c.rank >= neighbour_rank if after_id is None else table.c.rank <= neighbour_rank)
+
+    return await session.scalar(query) == 0
+
+
+async def get_rank_between_items(
+    session: AsyncSession, table: Table, list_columns: list[Column], before_id: int | None, after_id: int | None
+) -> tuple[float, list[int] | None]:
+    """The rank of an item moved between two items of a list. The list is rebalanced when their ranks are too close,
+    the ids of the renumbered list are returned in their new order then, as the ranks of all its items changed."""
+    ranks = await get_ranks(session, table, [before_id, after_id])
+    rank = get_rank_between(ranks.get(before_id), ranks.get(after_id))
+    if rank is not None:
+        return rank, None
+
+    same_list = _same_list_as(table, list_columns, before_id)
+    await session.execute(get_rebalance_query(table, list_columns, same_list))
+    renumbered_ids = list(await session.scalars(select(table.c.id).where(same_list).order_by(table.c.rank)))
+    ranks = await get_ranks(session, table, [before_id, after_id])
+    return get_rank_between(ranks.get(before_id), ranks.get(after_id)), renumbered_ids
+
+
+async def rebalance_ranks(database: Database, cache: Cache):
+    """The moves split the rank gaps in halves, renumber the lists before the gaps get too small. The ranks are part
+    of the API, the cached data of the users whose lists were renumbered is invalidated."""
+    async with database.transaction() as session:
+        section_query = get_rebalance_query(section, SECTION_LIST_COLUMNS).returning(section.c.user_id)
+        section_user_ids = set(await session.scalars(section_query))
+        link_query = (
+            get_rebalance_query(link, LINK_LIST_COLUMNS)
+            .where(section.c.id == link.c.section_id)
+            .returning(section.c.user_id)
+        )
+        link_user_ids = set(await session.scalars(link_query))
+
+    tags = {user_id: {CacheTag.LINKS, GENERATION_TAG} for user_id in link_user_ids}
+    for user_id in section_user_ids:
+        tags[user_id] = {CacheTag.SECTIONS, CacheTag.LINKS, GENERATION_TAG}
+
+    if not tags or not cache.enabled:
+        return
+
+    try:
+        await cache.invalidate_tags(
+            [get_tag_key(get_user_scope_key(user_id), tag) for user_id, user_tags in tags.items() for tag in user_tags]
+        )
+    except RedisError:
+        logger.exception("Unable to invalidate the cache of %s users after the rank rebalance", len(tags))
+
+
+def register_rebalance_job(scheduler: Scheduler, database: Database, cache: Cache):
+    scheduler.add_job(
+        "rebalanceRanks",
+        partial(rebalance_ranks, database, cache),
+        interval=timedelta(days=1),
+        jitter=timedelta(hours=1),
+    )
@@ -2,8 +2,9 @@ from graphene import Schema
 
 from yggdrasil.api.mutations import Mutation
 from yggdrasil.api.queries import Query
+from yggdrasil.api.subscriptions import Subscription
 
 
 def create_api_schema() -> Schema:
-    api_schema = Schema(query=Query, mutation=Mutation)
+    api_schema = Schema(query=Query, mutation=Mutation, subscription=Subscription)
     return api_schema
@@ -0,0 +1,31 @@
+from graphene import Field, NonNull, ObjectType, ResolveInfo
+from graphql import GraphQLError
+
+from yggdrasil.api.events import get_board_channel
+from yggdrasil.components.graphene.pydantic import object_type_from_pydantic
+from yggdrasil.components.graphene.tools import get_request_context
+from yggdrasil.schema import BoardEvent
+
+
+class Subscription(ObjectType):
+    board_events = Field(
+        NonNull(object_type_from_pydantic(BoardEvent)),
+        description="The changes of the board of the user, made in any session",
+    )
+
+    @staticmethod
+    async def subscribe_board_events(root, info: ResolveInfo):
+        request_context = get_request_context(info)
+        user = request_context.auth.get_user(info.context["request"])
+        if user is None:
+            raise GraphQLError("Authentication needed")
+        if not request_context.events.enabled:
+            raise GraphQLError("Live updates are not available")
+
+        # subscribed before the first event is awaited, so nothing published after the start message is missed. The
+        # subscription is closed by graphql when the operation is stopped, even before its first event.
+        return await request_context.events.subscribe(get_board_channel(user.id))
+
+    @staticmethod
+    def resolve_board_events(root: dict, info: ResolveInfo) -> BoardEvent:
+        return BoardEvent.model_validate(root)
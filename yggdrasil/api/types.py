@@ -1,6 +1,12 @@
 from pydantic import BaseModel, Field
 
 
+class CacheTag:
+    SECTIONS = "sections"
+    LINKS = "links"
+    BOARD_SETTINGS = "board_settings"
+
+
 class Error(BaseModel):
     msg: str
     type: str = ""
@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from time import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
 from typing import Callable
 
 from redis import Redis
@@ -7,39 +9,32 @@ from redis import asyncio as aioredis
 from starlette.applications import Starlette
 from starlette.middleware import Middleware
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.requests import Request
-from starlette.responses import JSONResponse
-from starlette.routing import Mount
-from starlette_graphene3 import GraphQLApp, make_graphiql_handler
+from starlette.routing import Mount, Route
+from starlette_graphene3 import make_graphiql_handler
 
+from yggdrasil.api.prewarm import register_prewarm_jobs
+from yggdrasil.api.ranks import register_rebalance_job
 from yggdrasil.api.schema import create_api_schema
 from yggdrasil.auth_controller import AuthController
 from yggdrasil.components.app_config import load_app_config, AppConfig
+from yggdrasil.components.cache import Cache, LocalCache
 from yggdrasil.components.database import Database
 from yggdrasil.components.env import environment
+from yggdrasil.components.event_bus import EventBus
+from yggdrasil.components.graphene.query_limits import create_query_limits_rule
+from yggdrasil.components.graphene.timing import instrument_engine, TimingMiddleware
+from yggdrasil.components.graphql_app import LoggedGraphQLApp
 from yggdrasil.components.logger import init_logger
+from yggdrasil.components.metrics import registry as metrics_registry
+from yggdrasil.components.persisted_queries import PersistedQueryStore
 from yggdrasil.components.request_context import RequestContext
 from yggdrasil.components.request_context_middleware import RequestContextMiddleware
+from yggdrasil.components.response_cache import ResponseCache
+from yggdrasil.components.scheduler import Scheduler
 
 logger = logging.getLogger(__name__)
 
 
-class LoggedGraphQLApp(GraphQLApp):
-    async def _handle_http_request(self, request: Request) -> JSONResponse:
-        start = time()
-        result = await super()._handle_http_request(request)
-        end = time()
-        milliseconds = (end - start) * 1000
-        request_data = await request.json()
-        logger.debug(
-            "Query time: %s ms, query string: %s, variables: %s",
-            round(milliseconds, 2),
-            request_data.get("query"),
-            request_data.get("variables"),
-        )
-        return result
-
-
 def get_app(
     config: AppConfig = None,
     session_middleware: type = SessionMiddleware,
@@ -60,18 +55,69 @@ def get_app(
     auth.register_oauth_clients()
     redis = redis_client_factory(config.redis_url)
 
-    request_context = RequestContext(Database(config.database_url), auth, config, redis)
+    cache = Cache(redis, LocalCache(config.local_cache.max_items, config.local_cache.max_bytes))
+
+    database = Database(
+        config.database_url,
+        config.database_replicas.urls,
+        redis,
+        timedelta(seconds=config.database_replicas.read_your_writes_seconds),
+    )
+    for engine in database.engines:
+        instrument_engine(engine)
+
+    request_context = RequestContext(database, auth, config, redis, cache, EventBus(redis))
+
+    schema = create_api_schema()
+
+    response_cache = None
+    if config.response_cache.enabled:
+        response_cache = ResponseCache(cache, timedelta(seconds=config.response_cache.expiry_seconds))
+
+    streaming_min_items = config.response_streaming.min_items if config.response_streaming.enabled else None
+
+    scheduler = Scheduler(redis, timedelta(seconds=config.scheduler.leader_lock_timeout_seconds))
+    if cache.enabled:
+        register_prewarm_jobs(scheduler, schema, request_context)
+    register_rebalance_job(scheduler, database, cache)
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        tasks = []
+        if cache.enabled:
+            tasks.append(asyncio.create_task(cache.listen_for_invalidations()))
+        if config.scheduler.enabled:
+            tasks.append(asyncio.create_task(scheduler.run()))
+        yield
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     app = Starlette(
         debug,
         routes=[
-            Mount("/api", LoggedGraphQLApp(create_api_schema(), on_get=make_graphiql_handler())),
+            Mount(
+                "/api",
+                LoggedGraphQLApp(
+                    schema,
+                    on_get=make_graphiql_handler(),
+                    persisted_queries=PersistedQueryStore(cache),
+                    response_cache=response_cache,
+                    validation_rules=[create_query_limits_rule(config.query_limits)],
+                    middleware=[TimingMiddleware()],
+                    slow_operation_log=config.slow_operation_log,
+                    streaming_min_items=streaming_min_items,
+                ),
+            ),
             Mount("/auth", routes=auth.get_routes()),
+            Route("/metrics", metrics_registry.endpoint),
+            Route("/scheduler", scheduler.status_endpoint),
         ],
         middleware=[
             Middleware(RequestContextMiddleware, context_data=request_context),
             Middleware(session_middleware, secret_key=config.session_secret),
         ],
+        lifespan=lifespan,
     )
 
     return app
@@ -62,8 +62,8 @@ class AuthController:
         token = await client.authorize_access_token(request)
         logger.info("Token: %s", token)
         user_info = UserInfo(**token["userinfo"])
-        database_session = request.scope[RequestScopeKeys.DATABASE_SESSION]
-        await user_info.store(database_session)
+        database_session = request.scope[RequestScopeKeys.DATABASE_SESSION].get()
+        await user_info.store(database_session, request.scope[RequestScopeKeys.CONTEXT].cache)
         self.update_session_dict(request.session, user_info)
         return RedirectResponse("/")
 
@@ -1,7 +1,7 @@
 from pathlib import Path
 from yaml import safe_load
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class OAuthClient(BaseModel):
@@ -16,12 +16,55 @@ class ReditConfig(BaseModel):
     client_secret: str
 
 
+class LocalCacheConfig(BaseModel):
+    max_items: int = 10000
+    max_bytes: int = 64 * 1024 * 1024
+
+
+class SchedulerConfig(BaseModel):
+    enabled: bool = True
+    leader_lock_timeout_seconds: int = 60
+
+
+class ResponseCacheConfig(BaseModel):
+    enabled: bool = False
+    expiry_seconds: int = 3600
+
+
+class QueryLimitsConfig(BaseModel):
+    max_depth: int = 10
+    max_aliases: int = 20
+    max_cost: int = 50
+
+
+class SlowOperationLogConfig(BaseModel):
+    threshold_ms: int = 500
+    sample_rate: float = 0.1
+
+
+class ResponseStreamingConfig(BaseModel):
+    enabled: bool = False
+    min_items: int = 1000
+
+
+class DatabaseReplicasConfig(BaseModel):
+    urls: list[str] = Field(default_factory=list)
+    read_your_writes_seconds: int = 5
+
+
 class AppConfig(BaseModel):
     database_url: str
+    database_replicas: DatabaseReplicasConfig = Field(default_factory=DatabaseReplicasConfig)
     redis_url: str
     auth_clients: dict[str, OAuthClient]
     session_secret: str
     reddit: ReditConfig | None = None
+    local_cache: LocalCacheConfig = Field(default_factory=LocalCacheConfig)
+    scheduler: SchedulerConfig = Field(default_factory=SchedulerConfig)
+    response_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
+    query_limits: QueryLimitsConfig = Field(default_factory=QueryLimitsConfig)
+    slow_operation_log: SlowOperationLogConfig = Field(default_factory=SlowOperationLogConfig)
+    response_streaming: ResponseStreamingConfig = Field(default_factory=ResponseStreamingConfig)
 
 
 def load_app_config(file_path: str):
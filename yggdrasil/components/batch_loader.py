@@ -0,0 +1,50 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class BatchLoader(Generic[KeyType, ValueType]):
+    """Collects the keys requested during the same event loop iteration and loads them with one call.
+
+    The batch function receives the list of unique keys and must return the values in the same order.
+    """
+
+    def __init__(self, batch_fn: Callable[[list[KeyType]], Awaitable[list[ValueType]]]):
+        self._batch_fn = batch_fn
+        self._queue: dict[KeyType, asyncio.Future] = {}
+        # the event loop keeps weak references to the tasks only, a collected dispatch would leave its loads pending
+        self._dispatch_tasks: set[asyncio.Task] = set()
+
+    def load(self, key: KeyType) -> Awaitable[ValueType]:
+        if future := self._queue.get(key):
+            return future
+
+        loop = asyncio.get_running_loop()
+        if not self._queue:
+            loop.call_soon(self._schedule_dispatch)
+
+        future = self._queue[key] = loop.create_future()
+        return future
+
+    async def load_many(self, keys: list[KeyType]) -> list[ValueType]:
+        return list(await asyncio.gather(*[self.load(key) for key in keys]))
+
+    def _schedule_dispatch(self):
+        task = asyncio.ensure_future(self._dispatch())
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self):
+        queue, self._queue = self._queue, {}
+
+        try:
+            values = await self._batch_fn(list(queue.keys()))
+        except Exception as e:
+            for future in queue.values():
+                future.set_exception(e)
+            return
+
+        for future, value in zip(queue.values(), values):
+            future.set_result(value)
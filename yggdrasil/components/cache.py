@@ -0,0 +1,316 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from time import monotonic, perf_counter, time
+from typing import Any
+
+import orjson
+from redis import Redis
+from redis.exceptions import LockError, RedisError
+
+from yggdrasil.components import cache_codec
+from yggdrasil.components.batch_loader import BatchLoader
+from yggdrasil.components.cache_codec import CacheCodecError
+from yggdrasil.components.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+cache_flush_duration = registry.histogram("cache_flush_seconds", "Time spent writing the cache entries of a request")
+cache_flush_errors = registry.counter("cache_flush_errors_total", "Failed cache write flushes")
+
+GLOBAL_SCOPE_KEY = "global"
+# bumped together with every invalidation of a scope, so it changes whenever any data of the scope changes
+GENERATION_TAG = "generation"
+
+
+def get_user_scope_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def get_tag_key(scope_key: str, tag: str) -> str:
+    return f"cache-tag:{scope_key}:{tag}"
+
+
+@dataclass
+class _LocalCacheEntry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+@dataclass
+class CacheEntry:
+    data: Any
+    fresh_until: float
+
+    @property
+    def is_stale(self) -> bool:
+        return self.fresh_until <= time()
+
+
+@dataclass
+class CacheWrite:
+    key: str
+    raw_data: bytes
+    ttl: timedelta
+
+
+class LocalCache:
+    """Per worker LRU cache with item count and (estimated) memory limits"""
+
+    def __init__(self, max_items: int, max_bytes: int):
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, _LocalCacheEntry] = OrderedDict()
+        self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: str, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        if entry.expires_at <= monotonic():
+            self._remove(key)
+            return default
+
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(self, key: str, value, size: int, expiry: timedelta):
+        if size > self._max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = _LocalCacheEntry(value, size, monotonic() + expiry.total_seconds())
+        self._size += size
+
+        while len(self._entries) > self._max_items or self._size > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def delete(self, keys: list[str]):
+        for key in keys:
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: str):
+        if entry := self._entries.pop(key, None):
+            self._size -= entry.size
+
+
+class Cache:
+    """Two tier cache: the worker local LRU answers first, redis is the shared second tier.
+
+    Invalidations are broadcasted to every worker via redis pub/sub.
+    """
+
+    INVALIDATION_CHANNEL = "cache-invalidation"
+    TAG_VERSION_LOCAL_EXPIRY = timedelta(minutes=1)
+    LOCK_TIMEOUT = timedelta(seconds=30)
+    LOCK_WAIT_TIMEOUT = timedelta(seconds=10)
+    LOCK_WAIT_INTERVAL = timedelta(milliseconds=100)
+    INVALIDATION_RECONNECT_DELAY = timedelta(seconds=1)
+    INVALIDATION_MAX_RECONNECT_DELAY = timedelta(seconds=30)
+
+    def __init__(self, redis: Redis | None, local: LocalCache):
+        self.redis = redis
+        self.local = local
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis is not None
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: list[str]) -> list[CacheEntry | None]:
+        entries = [self.local.get(key) for key in keys]
+        missing_keys = [key for key, entry in zip(keys, entries) if entry is None]
+
+        if missing_keys:
+            fetched_entries = dict(zip(missing_keys, await self._get_many_from_redis(missing_keys)))
+            entries = [fetched_entries.get(key, entry) for key, entry in zip(keys, entries)]
+
+        return entries
+
+    async def _get_many_from_redis(self, keys: list[str]) -> list[CacheEntry | None]:
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            pipeline.mget(keys)
+            for key in keys:
+                pipeline.pttl(key)
+            raw_values, *ttls = await pipeline.execute()
+
+        return [self._decode_entry(key, raw_data, ttl) for key, raw_data, ttl in zip(keys, raw_values, ttls)]
+
+    def _decode_entry(self, key: str, raw_data: bytes | None, ttl: int) -> CacheEntry | None:
+        if raw_data is None:
+            return None
+
+        try:
+            entry = CacheEntry(**cache_codec.decode(raw_data))
+        except (CacheCodecError, TypeError):
+            logger.warning("Unable to decode cached data for %s", key)
+            return None
+
+        if ttl > 0:
+            self._set_local(key, entry, len(raw_data), timedelta(milliseconds=ttl))
+        return entry
+
+    def _set_local(self, key: str, entry: CacheEntry, size: int, ttl: timedelta):
+        """The local copies are kept while fresh only, the stale entries are looked up in redis where the refreshed
+        entry of another worker shows up"""
+        ttl = min(ttl, timedelta(seconds=entry.fresh_until - time()))
+        if ttl > timedelta():
+            self.local.set(key, entry, size, ttl)
+
+    @staticmethod
+    def encode(key: str, data, expiry: timedelta, stale_time: timedelta = None) -> CacheWrite:
+        raw_data = cache_codec.encode({"data": data, "fresh_until": time() + expiry.total_seconds()})
+        return CacheWrite(key, raw_data, expiry + stale_time if stale_time else expiry)
+
+    async def write(self, writes: list[CacheWrite]):
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            for write in writes:
+                pipeline.set(write.key, write.raw_data, write.ttl)
+            await pipeline.execute()
+
+        for write in writes:
+            entry = CacheEntry(**cache_codec.decode(write.raw_data))
+            self._set_local(write.key, entry, len(write.raw_data), write.ttl)
+
+    async def set(self, key: str, data, expiry: timedelta, stale_time: timedelta = None) -> int:
+        write = self.encode(key, data, expiry, stale_time)
+        await self.write([write])
+        return len(write.raw_data)
+
+    @asynccontextmanager
+    async def lock(self, key: str):
+        lock = self.redis.lock(f"lock:{key}", timeout=self.LOCK_TIMEOUT.total_seconds(), blocking=False)
+        try:
+            acquired = await lock.acquire()
+        except RedisError:
+            logger.warning("Unable to acquire lock for %s, continuing without it", key, exc_info=True)
+            acquired = None
+
+        if acquired is None:
+            yield True
+            return
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    await lock.release()
+                except LockError:
+                    logger.warning("Lock for %s expired before release", key)
+
+    async def get_fresh(self, key: str) -> CacheEntry | None:
+        """The fresh entry of the key from redis, skipping the local copy"""
+        entry = (await self._get_many_from_redis([key]))[0]
+        return entry if entry is not None and not entry.is_stale else None
+
+    async def wait_for(self, key: str) -> CacheEntry | None:
+        deadline = monotonic() + self.LOCK_WAIT_TIMEOUT.total_seconds()
+        while monotonic() < deadline:
+            await asyncio.sleep(self.LOCK_WAIT_INTERVAL.total_seconds())
+            try:
+                entry = await self.get_fresh(key)
+            except RedisError:
+                return None
+            if entry is not None:
+                return entry
+        return None
+
+    async def get_tag_versions(self, tag_keys: list[str]) -> list[int]:
+        versions = [self.local.get(key) for key in tag_keys]
+        missing_keys = [key for key, version in zip(tag_keys, versions) if version is None]
+
+        if missing_keys:
+            fetched_versions = dict(zip(missing_keys, await self.redis.mget(missing_keys)))
+            for key, version in fetched_versions.items():
+                self.local.set(key, int(version or 0), 0, self.TAG_VERSION_LOCAL_EXPIRY)
+            versions = [fetched_versions.get(key, version) for key, version in zip(tag_keys, versions)]
+
+        return [int(version or 0) for version in versions]
+
+    async def invalidate_tags(self, tag_keys: list[str]):
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            for key in tag_keys:
+                pipeline.incr(key)
+            pipeline.publish(self.INVALIDATION_CHANNEL, orjson.dumps(tag_keys))
+            await pipeline.execute()
+
+        self.local.delete(tag_keys)
+
+    async def listen_for_invalidations(self):
+        """Apply the invalidations of the other workers to the local tier, reconnecting when the connection is lost"""
+        delay = self.INVALIDATION_RECONNECT_DELAY
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                    # the invalidations published while disconnected are lost, the local tier may be outdated
+                    self.local.clear()
+                    delay = self.INVALIDATION_RECONNECT_DELAY
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        keys = orjson.loads(message["data"])
+                        logger.debug("Invalidation received for %s", keys)
+                        self.local.delete(keys)
+            except Exception:
+                logger.exception("Invalidation listener failed, reconnecting in %s seconds", delay.total_seconds())
+
+            await asyncio.sleep(delay.total_seconds())
+            delay = min(delay * 2, self.INVALIDATION_MAX_RECONNECT_DELAY)
+
+
+class RequestCache:
+    """Request scoped view of the cache.
+
+    Lookups issued in the same event loop iteration (e.g. by sibling fields of an operation) are sent to redis
+    together, writes are collected and flushed in one pipeline at the end of the request.
+    """
+
+    def __init__(self, cache: Cache):
+        self.cache = cache
+        self._entry_loader = BatchLoader(cache.get_many)
+        self._tag_version_loader = BatchLoader(cache.get_tag_versions)
+        self._pending_writes: dict[str, CacheWrite] = {}
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return await self._entry_loader.load(key)
+
+    async def get_tag_versions(self, tag_keys: list[str]) -> list[int]:
+        return await self._tag_version_loader.load_many(tag_keys)
+
+    def set(self, write: CacheWrite):
+        self._pending_writes[write.key] = write
+
+    async def flush(self):
+        if not self._pending_writes:
+            return
+
+        writes, self._pending_writes = list(self._pending_writes.values()), {}
+        start = perf_counter()
+        try:
+            await self.cache.write(writes)
+        except RedisError:
+            logger.exception("Unable to write %s cache entries", len(writes))
+            cache_flush_errors.inc()
+            return
+
+        cache_flush_duration.observe(perf_counter() - start)
@@ -0,0 +1,107 @@
+import zlib
+from abc import ABC, abstractmethod
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+COMPRESSION_THRESHOLD = 1024
+
+
+class CacheCodecError(Exception):
+    pass
+
+
+class CacheCodec(ABC):
+    header: int
+
+    @abstractmethod
+    def compress(self, payload: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def decompress(self, payload: bytes) -> bytes:
+        pass
+
+
+class PlainCodec(CacheCodec):
+    header = 1
+
+    def compress(self, payload: bytes) -> bytes:
+        return payload
+
+    def decompress(self, payload: bytes) -> bytes:
+        return payload
+
+
+class ZlibCodec(CacheCodec):
+    header = 2
+
+    def __init__(self, level: int = 1):
+        self._level = level
+
+    def compress(self, payload: bytes) -> bytes:
+        return zlib.compress(payload, self._level)
+
+    def decompress(self, payload: bytes) -> bytes:
+        return zlib.decompress(payload)
+
+
+_plain_codec = PlainCodec()
+_codecs: dict[int, CacheCodec] = {_plain_codec.header: _plain_codec}
+_compression_codec: CacheCodec = _plain_codec
+
+
+def register_codec(codec: CacheCodec, use_for_compression: bool = False):
+    global _compression_codec
+
+    _codecs[codec.header] = codec
+    if use_for_compression:
+        _compression_codec = codec
+
+
+def serialize_default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Row):
+        return value._asdict()
+    if hasattr(value, "__dict__"):
+        return value.__dict__
+    raise TypeError(f"Type is not serializable: {type(value)}")
+
+
+def encode(data) -> bytes:
+    """Serialize data with orjson and pack it"""
+    return pack(orjson.dumps(data, default=serialize_default, option=orjson.OPT_NON_STR_KEYS))
+
+
+def decode(raw: bytes):
+    try:
+        return orjson.loads(unpack(raw))
+    except orjson.JSONDecodeError as e:
+        raise CacheCodecError(f"Invalid cached payload: {e}") from e
+
+
+def pack(payload: bytes) -> bytes:
+    """Compress an already serialized payload above the threshold and prefix it with the codec header byte"""
+    if len(payload) > COMPRESSION_THRESHOLD:
+        compressed = _compression_codec.compress(payload)
+        if len(compressed) < len(payload):
+            return bytes([_compression_codec.header]) + compressed
+
+    return bytes([_plain_codec.header]) + payload
+
+
+def unpack(raw: bytes) -> bytes:
+    """Raise CacheCodecError for any value that cannot be unpacked: empty, truncated or corrupt ones"""
+    if not raw:
+        raise CacheCodecError("Empty cached value")
+    if (codec := _codecs.get(raw[0])) is None:
+        raise CacheCodecError(f"Unknown cache codec header: {raw[0]}")
+    try:
+        return codec.decompress(raw[1:])
+    except zlib.error as e:
+        raise CacheCodecError(f"Corrupt cached payload: {e}") from e
+
+
+register_codec(ZlibCodec(), use_for_compression=True)
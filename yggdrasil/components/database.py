@@ -1,12 +1,95 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
+from datetime import timedelta
+from itertools import cycle
 
+from redis import Redis
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+database_sessions = registry.counter("database_sessions_total", "Database sessions opened", ("target",))
+
+
+class SerializedSession(AsyncSession):
+    """The resolvers of sibling fields run concurrently but share the session of the request, which does not support
+    concurrent operations, so the statements are executed one after the other"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = asyncio.Lock()
+
+    async def execute(self, *args, **kwargs):
+        async with self._lock:
+            return await super().execute(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        async with self._lock:
+            return await super().get(*args, **kwargs)
+
+    async def commit(self):
+        async with self._lock:
+            return await super().commit()
+
+
+class LazySession:
+    """The session of a request, opened the first time it is needed. Most of the requests are served from the cache
+    or do not touch the database at all. The reads of query operations get a separate session on a replica."""
+
+    def __init__(self, database: "Database"):
+        self._database = database
+        self._sessions: dict[bool, SerializedSession] = {}
+        self._read_from_primary: bool | None = None
+
+    @property
+    def opened(self) -> bool:
+        return bool(self._sessions)
+
+    def get(self, read_only: bool = False) -> SerializedSession:
+        read_only = read_only and bool(self._database.replica_engines) and not self._read_from_primary
+        if read_only not in self._sessions:
+            self._sessions[read_only] = self._database.create_session(read_only)
+        return self._sessions[read_only]
+
+    async def route_reads(self, user_id: int | None):
+        """Keep the reads of the user on the primary for a while after their writes, as the replicas may lag behind"""
+        if self._read_from_primary is None and self._database.replica_engines:
+            self._read_from_primary = await self._database.has_recent_writes(user_id)
+
+    def mark_writes(self):
+        """The later reads of the request must see the writes, they are served by the primary"""
+        self._read_from_primary = True
+
+    async def close(self):
+        for session in self._sessions.values():
+            await session.close()
+
 
 class Database:
-    def __init__(self, url: str, echo=False):
+    RECENT_WRITES_KEY_PREFIX = "recent-writes"
+
+    def __init__(
+        self,
+        url: str,
+        replica_urls: list[str] = None,
+        redis: Redis = None,
+        read_your_writes_time: timedelta = timedelta(seconds=5),
+        echo=False,
+    ):
         self._url = url
         self.engine = create_async_engine(url, echo=echo)
+        self.replica_engines = [create_async_engine(replica_url, echo=echo) for replica_url in replica_urls or []]
+        self._replica_engine_cycle = cycle(self.replica_engines)
+        self._redis = redis
+        self._read_your_writes_time = read_your_writes_time
+
+    @property
+    def engines(self):
+        return [self.engine, *self.replica_engines]
 
     @asynccontextmanager
     async def transaction(self):
@@ -14,7 +97,35 @@ class Database:
             async with session.begin():
                 yield session
 
+    def create_session(self, read_only: bool = False) -> SerializedSession:
+        if read_only and self.replica_engines:
+            database_sessions.inc("replica")
+            return SerializedSession(next(self._replica_engine_cycle))
+        database_sessions.inc("primary")
+        return SerializedSession(self.engine)
+
     @asynccontextmanager
     async def session(self):
-        async with AsyncSession(self.engine) as session:
+        async with self.create_session() as session:
             yield session
+
+    def _get_recent_writes_key(self, user_id: int) -> str:
+        return f"{self.RECENT_WRITES_KEY_PREFIX}:{user_id}"
+
+    async def mark_recent_writes(self, user_id: int | None):
+        if not self.replica_engines or self._redis is None or user_id is None:
+            return
+        try:
+            await self._redis.set(self._get_recent_writes_key(user_id), 1, ex=self._read_your_writes_time)
+        except RedisError:
+            logger.exception("Unable to mark the recent writes of user %s", user_id)
+
+    async def has_recent_writes(self, user_id: int | None) -> bool:
+        if self._redis is None or user_id is None:
+            return False
+        try:
+            return await self._redis.get(self._get_recent_writes_key(user_id)) is not None
+        except RedisError:
+            logger.exception("Unable to check the recent writes of user %s", user_id)
+            # the primary is always up to date
+            return True
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from hashlib import blake2b
+
+from typing import Type
+
+from graphql import DocumentNode, GraphQLError, GraphQLSchema, ValidationRule, parse, specified_rules, validate
+
+from yggdrasil.components.metrics import registry
+
+document_cache_hits = registry.counter("document_cache_hits_total", "GraphQL documents served already validated")
+document_cache_misses = registry.counter("document_cache_misses_total", "GraphQL documents parsed and validated")
+
+
+class DocumentValidationError(Exception):
+    def __init__(self, errors: list[GraphQLError]):
+        super().__init__("DocumentValidationError")
+        self.errors = errors
+
+
+class DocumentCache:
+    """LRU of the parsed and validated documents, keyed by the hash of the query text"""
+
+    def __init__(self, schema: GraphQLSchema, rules: list[Type[ValidationRule]] = None, max_items: int = 1000):
+        self._schema = schema
+        self._rules = [*specified_rules, *(rules or [])]
+        self._max_items = max_items
+        self._documents: OrderedDict[str, DocumentNode] = OrderedDict()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def get(self, query: str) -> DocumentNode:
+        """Return the validated document of the query, raise DocumentValidationError if it is invalid"""
+        key = blake2b(query.encode(), digest_size=16).hexdigest()
+
+        if (document := self._documents.get(key)) is not None:
+            self._documents.move_to_end(key)
+            document_cache_hits.inc()
+            return document
+
+        document_cache_misses.inc()
+
+        try:
+            document = parse(query)
+        except GraphQLError as error:
+            raise DocumentValidationError([error])
+
+        if errors := validate(self._schema, document, self._rules):
+            raise DocumentValidationError(errors)
+
+        # only valid documents are stored, so random invalid queries cannot flush the cache
+        self._documents[key] = document
+        if len(self._documents) > self._max_items:
+            self._documents.popitem(last=False)
+
+        return document
@@ -0,0 +1,71 @@
+import logging
+import orjson
+from redis import Redis
+from redis.exceptions import RedisError
+
+from .cache_codec import serialize_default
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+events_published = registry.counter("events_published_total", "Events published on the event bus")
+event_publish_errors = registry.counter("event_publish_errors_total", "Events that could not be published")
+
+
+class EventBus:
+    """JSON events over redis pub/sub channels"""
+
+    def __init__(self, redis: Redis | None):
+        self.redis = redis
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis is not None
+
+    async def publish(self, channel: str, event):
+        """The events are published after the data is committed, a failure must not fail the request"""
+        if not self.enabled:
+            return
+
+        try:
+            await self.redis.publish(channel, orjson.dumps(event, default=serialize_default))
+        except RedisError:
+            logger.exception("Unable to publish event to %s", channel)
+            event_publish_errors.inc()
+            return
+
+        events_published.inc()
+
+    async def subscribe(self, channel: str) -> "EventSubscription":
+        """Subscribe to the channel right away, so the events published after the call are not missed"""
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+        except BaseException:
+            await pubsub.aclose()
+            raise
+        return EventSubscription(pubsub)
+
+
+class EventSubscription:
+    """The events of a subscribed channel. The pubsub connection is released by aclose, whether the events were
+    iterated or not."""
+
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+        self._closed = False
+
+    def __aiter__(self) -> "EventSubscription":
+        return self
+
+    async def __anext__(self) -> dict:
+        while not self._closed:
+            message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            if message is not None and message["type"] == "message":
+                return orjson.loads(message["data"])
+        raise StopAsyncIteration
+
+    async def aclose(self):
+        if not self._closed:
+            self._closed = True
+            await self._pubsub.aclose()
@@ -0,0 +1,58 @@
+import asyncio
+from abc import ABCMeta, abstractmethod
+from typing import Awaitable, Hashable, TypeVar
+
+from graphene import ResolveInfo
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .tools import get_request_context, is_read_only_operation
+from ..batch_loader import BatchLoader
+from ..request_context import RequestContext
+from ..types import RequestScopeKeys
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class DataLoader(BatchLoader[KeyType, ValueType], metaclass=ABCMeta):
+    """Request scoped batch loader for resolvers.
+
+    The keys loaded by the resolvers of the same execution step are fetched with one `batch_load` call, and the
+    results are memoized until the end of the request. Get the instance of the request with `DataLoader.get(info)`.
+    """
+
+    def __init__(self, info: ResolveInfo):
+        super().__init__(self.batch_load)
+        self._info = info
+        self._results: dict[KeyType, asyncio.Future] = {}
+
+    @classmethod
+    def get(cls, info: ResolveInfo):
+        loaders = info.context["request"].scope.setdefault(RequestScopeKeys.DATA_LOADERS, {})
+        if cls not in loaders:
+            loaders[cls] = cls(info)
+        return loaders[cls]
+
+    @abstractmethod
+    async def batch_load(self, keys: list[KeyType]) -> list[ValueType]:
+        """Return the values of the keys in the same order"""
+
+    @property
+    def db_session(self) -> AsyncSession:
+        database_session = self._info.context["request"].scope[RequestScopeKeys.DATABASE_SESSION]
+        return database_session.get(read_only=is_read_only_operation(self._info))
+
+    @property
+    def request_context(self) -> RequestContext:
+        return get_request_context(self._info)
+
+    @property
+    def user_info(self):
+        return self.request_context.auth.get_user(self._info.context["request"])
+
+    def load(self, key: KeyType) -> Awaitable[ValueType]:
+        result = self._results.get(key)
+        # failed loads are not memoized
+        if result is None or (result.done() and (result.cancelled() or result.exception())):
+            result = self._results[key] = super().load(key)
+        return result
@@ -1,26 +1,48 @@
-import base64
 import logging
 from abc import ABCMeta, abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import timedelta
+from enum import Enum
 from functools import cached_property
-from typing import Generic, Type, TypeVar
+from hashlib import blake2b
+from time import perf_counter
+from typing import Generic, Iterable, Type, TypeVar
 
 import orjson
 from graphene import Field, InputObjectType, ResolveInfo
 from graphene.utils.orderedtype import OrderedType
 from pydantic import BaseModel
+from redis.exceptions import RedisError
+from sqlalchemy import Column, Table
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
 from .pydantic import create_class_property_dict
-from .tools import get_field_name_list, get_request_context, create_json_serializable_data
+from .timing import measure
+from .tools import get_field_name_list, get_request_context, is_read_only_operation
+from ..database import LazySession
+from ..cache import CacheEntry, GENERATION_TAG, GLOBAL_SCOPE_KEY, get_tag_key, get_user_scope_key, RequestCache
+from ..metrics import registry, SIZE_BUCKETS
 from ..request_context import RequestContext
 from ..types import RequestScopeKeys
 
 InputType = TypeVar("InputType")
 logger = logging.getLogger(__name__)
 
+cache_hits = registry.counter("node_cache_hits_total", "Node results served from cache", ("node",))
+cache_misses = registry.counter("node_cache_misses_total", "Node results not found in cache", ("node",))
+cache_stale_serves = registry.counter(
+    "node_cache_stale_serves_total", "Stale node results served during refresh", ("node",)
+)
+cache_redis_errors = registry.counter("node_cache_redis_errors_total", "Redis errors during node caching", ("node",))
+cache_set_duration = registry.histogram(
+    "node_cache_set_seconds", "Time spent encoding (and for single flight nodes storing) node results", ("node",)
+)
+cache_payload_size = registry.histogram(
+    "node_cache_payload_bytes", "Encoded size of cached node results", ("node",), SIZE_BUCKETS
+)
+
 
 class NoArgumentsDefinedError(Exception):
     pass
@@ -32,12 +54,24 @@ class NodeValidationError(Exception):
         self.result = result
 
 
+class CacheScope(Enum):
+    GLOBAL = "GLOBAL"
+    USER = "USER"
+
+
 @dataclass
 class NodeConfig:
     result_type: OrderedType | type
     input_validator: Type[BaseModel] = None
     description: str = None
     cache_expiry_time: timedelta = None
+    cache_stale_time: timedelta = None
+    cache_single_flight: bool = False
+    cache_scope: CacheScope = CacheScope.GLOBAL
+    cache_tags: set[str] = field(default_factory=set)
+    invalidates_cache_tags: set[str] = field(default_factory=set)
+    # weight of the field in the query limits, relative to a single database query, see query_limits.py
+    cost: int = 1
     field_extra: dict = field(default_factory=dict)
 
 
@@ -61,12 +95,15 @@ class NodeBase(Generic[InputType], metaclass=_NodeConfigChecker):
 
     _info: ResolveInfo
     _args: InputType = None
+    _cache_key: str = None
+    _cache_error: bool = False
 
     def __init__(self, root, info, **kwargs):
         self._root = root
         self._info = info
 
         self._kwargs = kwargs
+        self._events: list[tuple[str, object]] = []
 
     @abstractmethod
     async def resolve(self):
@@ -74,12 +111,40 @@ class NodeBase(Generic[InputType], metaclass=_NodeConfigChecker):
 
     @cached_property
     def field_names(self):
-        return list(sorted(get_field_name_list(self._info.field_nodes[0])))
+        names = set()
+        for field_node in self._info.field_nodes:
+            names.update(get_field_name_list(field_node, self._info.fragments, self._info.variable_values))
+        return list(sorted(names))
+
+    @cached_property
+    def selected_fields(self) -> set[str]:
+        """The requested field names without the name of the node field, like `background.type`"""
+        return {name.partition(".")[2] for name in self.field_names}
+
+    def get_selected_columns(
+        self, table: Table, field_columns: dict[str, list[str]] = None, required: Iterable[str] = ("id",)
+    ) -> list[Column]:
+        """The columns of the table backing the requested fields, so the unused (and possibly large) columns are not
+        fetched. A field is backed by the column of the same name, unless field_columns maps it to other columns."""
+        field_columns = field_columns or {}
+        names = set(required)
+        for field_name in self.selected_fields:
+            names.update(field_columns.get(field_name, [field_name]))
+        return [column for column in table.c if column.name in names]
 
     @property
-    def db_session(self) -> AsyncSession:
+    def database_session(self) -> LazySession:
         return self._info.context["request"].scope[RequestScopeKeys.DATABASE_SESSION]
 
+    @property
+    def db_session(self) -> AsyncSession:
+        """A replica session in the queries, the primary one in the mutations"""
+        return self.database_session.get(read_only=is_read_only_operation(self._info))
+
+    @property
+    def user_id(self) -> int | None:
+        return self.user_info.id if self.user_info else None
+
     @property
     def request_context(self) -> RequestContext:
         return get_request_context(self._info)
@@ -92,6 +157,14 @@ class NodeBase(Generic[InputType], metaclass=_NodeConfigChecker):
     def http_request(self) -> Request:
         return self._info.context["request"]
 
+    @property
+    def request_cache(self) -> RequestCache:
+        return self.http_request.scope[RequestScopeKeys.REQUEST_CACHE]
+
+    @property
+    def force_cache_refresh(self) -> bool:
+        return self.http_request.scope.get(RequestScopeKeys.CACHE_REFRESH, False)
+
     @property
     def args(self) -> InputType:
         if not self.config.input_validator:
@@ -104,49 +177,173 @@ class NodeBase(Generic[InputType], metaclass=_NodeConfigChecker):
     async def validate(self):
         pass
 
+    def publish_event(self, channel: str, event):
+        """The event is published once the node is resolved and its cache tags are invalidated, so the subscribers
+        refetching on the event get the new data"""
+        self._events.append((channel, event))
+
     @classmethod
     async def _resolve(cls, root, info, **kwargs):
         obj = cls(root, info, **kwargs)
 
-        if data := await obj.get_data_from_cache():
-            return data
+        cache_entry = None if obj.force_cache_refresh else await obj.get_data_from_cache()
+        if cache_entry and not cache_entry.is_stale:
+            return cache_entry.data
 
-        try:
-            await obj.validate()
-        except NodeValidationError as e:
-            return e.result
+        async with obj.cache_refresh_lock() as acquired:
+            if not acquired:
+                if cache_entry:
+                    logger.debug("Stale data served for %s while it is being refreshed", obj._cache_key)
+                    cache_stale_serves.inc(cls.__name__)
+                    return cache_entry.data
+                if cache_entry := await obj.request_context.cache.wait_for(obj._cache_key):
+                    return cache_entry.data
+            elif cache_entry := await obj.get_refreshed_data_from_cache():
+                return cache_entry.data
+
+            read_only = is_read_only_operation(info)
+            if read_only:
+                await obj.database_session.route_reads(obj.user_id)
+
+            try:
+                await obj.validate()
+            except NodeValidationError as e:
+                return e.result
+
+            result = await obj.resolve()
 
-        result = await obj.resolve()
+            if not read_only:
+                obj.database_session.mark_writes()
+                await obj.request_context.db.mark_recent_writes(obj.user_id)
 
-        await obj.set_data_to_cache(result)
+            await obj.set_data_to_cache(result)
+
+        if cls.config.invalidates_cache_tags:
+            # the data loader results memoized in the request may be outdated after a mutation
+            obj.http_request.scope.pop(RequestScopeKeys.DATA_LOADERS, None)
+
+        await obj.invalidate_cache_tags()
+
+        for channel, event in obj._events:
+            await obj.request_context.events.publish(channel, event)
 
         return result
 
     @cached_property
-    def cache_key(self) -> str:
-        key = f"{self.__class__.__name__}-{','.join(self.field_names)}"
-        if self._kwargs:
-            sorted_args = dict(sorted(self._kwargs.items()))
-            key += "_" + base64.encodebytes(orjson.dumps(sorted_args)).decode()
-        return key
+    def cache_scope_key(self) -> str | None:
+        if self.config.cache_scope == CacheScope.USER:
+            return get_user_scope_key(self.user_info.id) if self.user_info else None
+        return GLOBAL_SCOPE_KEY
+
+    def get_cache_tag_key(self, tag: str) -> str:
+        return get_tag_key(self.cache_scope_key, tag)
+
+    @property
+    def is_cacheable(self) -> bool:
+        if not self.config.cache_expiry_time or not self.request_context.cache.enabled or self._cache_error:
+            return False
+        return self.cache_scope_key is not None
+
+    def _handle_cache_error(self, action: str):
+        logger.exception("Redis error while %s for %s", action, self.__class__.__name__)
+        cache_redis_errors.inc(self.__class__.__name__)
+        self._cache_error = True
+
+    async def get_cache_key(self) -> str:
+        if self._cache_key:
+            return self._cache_key
+        tag_versions = {}
+        if self.config.cache_tags:
+            tags = sorted(self.config.cache_tags)
+            versions = await self.request_cache.get_tag_versions([self.get_cache_tag_key(tag) for tag in tags])
+            tag_versions = dict(zip(tags, versions))
+        key_data = orjson.dumps([self.field_names, self._kwargs, tag_versions], option=orjson.OPT_SORT_KEYS)
+        digest = blake2b(key_data, digest_size=16).hexdigest()
+        self._cache_key = f"{self.__class__.__name__}:{self.cache_scope_key}:{digest}"
+        return self._cache_key
 
     async def set_data_to_cache(self, data):
-        if not self.config.cache_expiry_time:
+        if not self.is_cacheable:
             return
 
-        await self.request_context.redis.set(
-            self.cache_key, orjson.dumps(create_json_serializable_data(data)), self.config.cache_expiry_time
-        )
+        start = perf_counter()
+        try:
+            with measure("cache"):
+                write = self.request_context.cache.encode(
+                    await self.get_cache_key(),
+                    data,
+                    self.config.cache_expiry_time,
+                    self.config.cache_stale_time,
+                )
+                # the lock waiters poll redis for the result, so it cannot wait for the end of the request
+                if self.config.cache_single_flight:
+                    await self.request_context.cache.write([write])
+                else:
+                    self.request_cache.set(write)
+                # freshly resolved global data is visible to every user, their cached responses must not be served
+                if self.config.cache_scope == CacheScope.GLOBAL:
+                    await self.request_context.cache.invalidate_tags([self.get_cache_tag_key(GENERATION_TAG)])
+        except RedisError:
+            return self._handle_cache_error("storing data")
+
+        cache_set_duration.observe(perf_counter() - start, self.__class__.__name__)
+        cache_payload_size.observe(len(write.raw_data), self.__class__.__name__)
+
+    async def get_data_from_cache(self) -> CacheEntry | None:
+        if not self.is_cacheable:
+            return
 
-    async def get_data_from_cache(self):
-        if not self.config.cache_expiry_time:
+        try:
+            with measure("cache"):
+                cache_key = await self.get_cache_key()
+                entry = await self.request_cache.get(cache_key)
+        except RedisError:
+            return self._handle_cache_error("fetching data")
+
+        if entry:
+            logger.debug("Data served from cache for %s", cache_key)
+            if not entry.is_stale:
+                cache_hits.inc(self.__class__.__name__)
+            return entry
+
+        logger.debug("Cached data not found for %s", cache_key)
+        cache_misses.inc(self.__class__.__name__)
+
+    async def get_refreshed_data_from_cache(self) -> CacheEntry | None:
+        """Another worker may have refreshed the data between the cache lookup and the lock acquisition"""
+        if not self.config.cache_single_flight or not self.is_cacheable or self.force_cache_refresh:
+            return
+
+        try:
+            with measure("cache"):
+                return await self.request_context.cache.get_fresh(await self.get_cache_key())
+        except RedisError:
+            return self._handle_cache_error("fetching data")
+
+    @asynccontextmanager
+    async def cache_refresh_lock(self):
+        if not self.config.cache_single_flight or not self.is_cacheable:
+            yield True
+            return
+
+        async with self.request_context.cache.lock(await self.get_cache_key()) as acquired:
+            yield acquired
+
+    async def invalidate_cache_tags(self):
+        if not self.config.invalidates_cache_tags or not self.request_context.cache.enabled:
             return
 
-        if data := await self.request_context.redis.get(self.cache_key):
-            logger.debug("Data served from cache for %s", self.cache_key)
-            return orjson.loads(data)
+        if self.cache_scope_key is None:
+            return
+
+        try:
+            await self.request_context.cache.invalidate_tags(
+                [self.get_cache_tag_key(tag) for tag in self.config.invalidates_cache_tags | {GENERATION_TAG}]
+            )
+        except RedisError:
+            return self._handle_cache_error("invalidating tags")
 
-        logger.debug("Cached data not found for %s", self.cache_key)
+        logger.debug("Cache tags invalidated for %s: %s", self.cache_scope_key, self.config.invalidates_cache_tags)
 
     @classmethod
     def field(cls) -> Field:
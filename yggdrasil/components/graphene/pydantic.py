@@ -2,6 +2,7 @@ import enum
 import inspect
 import uuid
 from datetime import date, datetime
+from functools import cache
 from ipaddress import IPv4Address
 from typing import Tuple, Type, Union, get_args, get_origin, Annotated
 from pydantic import HttpUrl
@@ -44,6 +45,7 @@ _graphene_type_registry: dict[str, List] = {}
 
 def clear_type_registry() -> None:
     _graphene_type_registry.clear()
+    get_model_annotations.cache_clear()
 
 
 def object_type_from_pydantic(
@@ -54,18 +56,14 @@ def object_type_from_pydantic(
     if base_type == InputObjectType:
         model_name += "Input"
 
-    type_ = _graphene_type_registry.get(
-        model_name,
-        type(
+    if model_name not in _graphene_type_registry:
+        _graphene_type_registry[model_name] = type(
             model_name,
             (base_type,),
             create_class_property_dict(model, base_type, ignored_fields),
-        ),
-    )
-
-    _graphene_type_registry[model_name] = type_
+        )
 
-    return type_
+    return _graphene_type_registry[model_name]
 
 
 def create_class_property_dict(
@@ -75,9 +73,7 @@ def create_class_property_dict(
 ) -> dict:
     # TODO: rewrite this stuff, the typing.Annotated stuff is messy
     properties = {}
-    collector = AnnotationsCollector(model)
-    collector.collect()
-    for property_name, type_ in collector.annotations.items():
+    for property_name, type_ in get_model_annotations(model).items():
         if ignored_fields and property_name in ignored_fields:
             continue
 
@@ -131,9 +127,9 @@ def create_class_property_dict(
 
 def create_graphene_enum(type_: Type[enum.Enum]) -> Type[Enum]:
     enum_name = type_.__name__
-    graphene_enum_type = _graphene_type_registry.get(enum_name, Enum.from_enum(type_))
-    _graphene_type_registry[enum_name] = graphene_enum_type
-    return graphene_enum_type
+    if enum_name not in _graphene_type_registry:
+        _graphene_type_registry[enum_name] = Enum.from_enum(type_)
+    return _graphene_type_registry[enum_name]
 
 
 def _create_list_item_class(type_: type, sub_type: Type[BaseType] = ObjectType) -> type:
@@ -144,13 +140,7 @@ def _create_list_item_class(type_: type, sub_type: Type[BaseType] = ObjectType)
 
     if BaseModel in inspect.getmro(class_):
         list_item_class_name = class_.__name__.replace(VALIDATOR_CLASS_NAME_PREFIX, "")
-
-        list_item_class = _graphene_type_registry.get(
-            list_item_class_name, object_type_from_pydantic(class_, list_item_class_name, sub_type)
-        )
-
-        _graphene_type_registry[list_item_class_name] = list_item_class
-        return list_item_class
+        return object_type_from_pydantic(class_, list_item_class_name, sub_type)
 
     raise ConversionError(f"Unhandled list item type: '{class_}'")
 
@@ -190,6 +180,14 @@ class AnnotationsCollector:
         return self._annotations
 
 
+@cache
+def get_model_annotations(model: type) -> dict:
+    """The annotations of the model and its bases, the closest definition wins"""
+    collector = AnnotationsCollector(model)
+    collector.collect()
+    return collector.annotations
+
+
 def get_base_scalar_type(type_) -> type:
     for key in _TYPE_MAP_SCALARS.keys():
         if issubclass(type_, key):
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Type
+
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLNamedType,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    ValidationContext,
+    ValidationRule,
+    get_named_type,
+    get_nullable_type,
+    is_list_type,
+)
+
+from .tools import get_node_class
+from ..app_config import QueryLimitsConfig
+from ..metrics import registry
+
+query_limit_rejections = registry.counter(
+    "query_limit_rejections_total", "Operations rejected by the query limits", ("limit",)
+)
+
+
+# the estimated length of the lists, the node fields below a list are resolved once per item
+LIST_FAN_OUT = 10
+
+
+def get_field_cost(field: GraphQLField) -> int:
+    """The cost declared in the NodeConfig of the node resolving the field, plain fields are free"""
+    node_class = get_node_class(field)
+    return node_class.config.cost if node_class else 0
+
+
+@dataclass
+class OperationCost:
+    depth: int = 0
+    aliases: int = 0
+    cost: int = 0
+
+
+class _CostAnalyzer:
+    def __init__(self, context: ValidationContext):
+        self._context = context
+        self.result = OperationCost()
+
+    def analyze(
+        self,
+        selection_set: SelectionSetNode,
+        parent_type: GraphQLNamedType,
+        depth: int,
+        fragment_names: frozenset,
+        multiplier: int = 1,
+    ):
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                self._analyze_field(selection, parent_type, depth, fragment_names, multiplier)
+            elif isinstance(selection, InlineFragmentNode):
+                type_ = parent_type
+                if selection.type_condition:
+                    type_ = self._context.schema.get_type(selection.type_condition.name.value)
+                self.analyze(selection.selection_set, type_, depth, fragment_names, multiplier)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self._context.get_fragment(name)
+                # cycles and unknown fragments are reported by the standard rules
+                if fragment is None or name in fragment_names:
+                    continue
+                type_ = self._context.schema.get_type(fragment.type_condition.name.value)
+                self.analyze(fragment.selection_set, type_, depth, fragment_names | {name}, multiplier)
+
+    def _analyze_field(
+        self, node: FieldNode, parent_type: GraphQLNamedType, depth: int, fragment_names: frozenset, multiplier: int
+    ):
+        if node.name.value.startswith("__"):
+            return
+
+        field = getattr(parent_type, "fields", {}).get(node.name.value)
+        if field is None:
+            return
+
+        self.result.depth = max(self.result.depth, depth)
+        self.result.cost += get_field_cost(field) * multiplier
+        if node.alias:
+            self.result.aliases += 1
+
+        if node.selection_set:
+            if is_list_type(get_nullable_type(field.type)):
+                multiplier *= LIST_FAN_OUT
+            self.analyze(node.selection_set, get_named_type(field.type), depth + 1, fragment_names, multiplier)
+
+
+def create_query_limits_rule(config: QueryLimitsConfig) -> Type[ValidationRule]:
+    class QueryLimitsRule(ValidationRule):
+        """Reject expensive operations before any resolver runs"""
+
+        def enter_operation_definition(self, node: OperationDefinitionNode, *args):
+            root_type = self.context.schema.get_root_type(node.operation)
+            if root_type is None:
+                return
+
+            analyzer = _CostAnalyzer(self.context)
+            analyzer.analyze(node.selection_set, root_type, 1, frozenset())
+            result = analyzer.result
+
+            for limit, value, max_value in [
+                ("depth", result.depth, config.max_depth),
+                ("aliases", result.aliases, config.max_aliases),
+                ("cost", result.cost, config.max_cost),
+            ]:
+                if value > max_value:
+                    query_limit_rejections.inc(limit)
+                    self.report_error(
+                        GraphQLError(f"Operation {limit} {value} exceeds the maximum of {max_value}", node)
+                    )
+
+    return QueryLimitsRule
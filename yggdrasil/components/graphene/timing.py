@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from inspect import isawaitable
+from time import perf_counter
+
+from graphene import ResolveInfo
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .tools import get_node_class
+from ..metrics import registry
+
+resolver_seconds = registry.summary(
+    "resolver_seconds", "Time spent resolving the root fields, and the database and cache part of it", ("node", "kind")
+)
+
+
+@dataclass
+class FieldTiming:
+    db: float = 0
+    cache: float = 0
+
+
+_current_field_timing: ContextVar[FieldTiming | None] = ContextVar("current_field_timing", default=None)
+
+
+def add_time(kind: str, seconds: float):
+    """Attribute the time to the field being resolved, if any"""
+    if timing := _current_field_timing.get():
+        setattr(timing, kind, getattr(timing, kind) + seconds)
+
+
+@contextmanager
+def measure(kind: str):
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        add_time(kind, perf_counter() - start)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Measure the statements with the cursor events, so the time spent waiting for the connection or the session
+    lock is not counted as database time"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_start", []).append(perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        add_time("db", perf_counter() - conn.info["statement_start"].pop())
+
+
+def get_timed_node_name(info: ResolveInfo) -> str | None:
+    """The root fields and the nodes are timed, the rest are plain attribute lookups not worth the overhead"""
+    field = info.parent_type.fields[info.field_name]
+    if node_class := get_node_class(field):
+        return node_class.__name__
+    if info.path.prev is None:
+        return info.field_name
+    return None
+
+
+class TimingMiddleware:
+    """Graphene middleware recording the resolve, database and cache time of the nodes"""
+
+    def resolve(self, next_, root, info: ResolveInfo, **kwargs):
+        node_name = get_timed_node_name(info)
+        if node_name is None:
+            return next_(root, info, **kwargs)
+        return self._timed_resolve(node_name, next_, root, info, **kwargs)
+
+    async def _timed_resolve(self, node_name: str, next_, root, info: ResolveInfo, **kwargs):
+        timing = FieldTiming()
+        token = _current_field_timing.set(timing)
+        start = perf_counter()
+        try:
+            result = next_(root, info, **kwargs)
+            if isawaitable(result):
+                result = await result
+            return result
+        finally:
+            _current_field_timing.reset(token)
+            resolver_seconds.observe(perf_counter() - start, node_name, "resolve")
+            resolver_seconds.observe(timing.db, node_name, "db")
+            resolver_seconds.observe(timing.cache, node_name, "cache")
@@ -1,19 +1,50 @@
-from graphene import ObjectType, ResolveInfo
-from graphql import FieldNode
+from typing import Iterator
+
+from graphene import ResolveInfo
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLField,
+    InlineFragmentNode,
+    OperationType,
+    SelectionSetNode,
+)
+from graphql.execution.collect_fields import should_include_node
 from graphql.pyutils.convert_case import camel_to_snake
-from pydantic import BaseModel
 
 from yggdrasil.components.request_context import RequestContext
 from yggdrasil.components.types import RequestScopeKeys
 
 
-def get_field_name_list(node: FieldNode) -> list[str]:
-    names = []
-    for sub_field in node.selection_set.selections:
-        if not isinstance(sub_field, FieldNode):
+def iterate_selected_fields(
+    selection_set: SelectionSetNode,
+    fragments: dict[str, FragmentDefinitionNode] = None,
+    variables: dict = None,
+) -> Iterator[FieldNode]:
+    """Yield the fields of a selection set with fragments resolved and @skip/@include directives applied. The meta
+    fields like `__typename`, added by the clients to every selection, are not data fields and are skipped."""
+    for selection in selection_set.selections:
+        if not should_include_node(variables or {}, selection):
             continue
+        if isinstance(selection, FieldNode):
+            if not selection.name.value.startswith("__"):
+                yield selection
+        elif isinstance(selection, InlineFragmentNode):
+            yield from iterate_selected_fields(selection.selection_set, fragments, variables)
+        elif isinstance(selection, FragmentSpreadNode) and fragments and selection.name.value in fragments:
+            yield from iterate_selected_fields(fragments[selection.name.value].selection_set, fragments, variables)
+
+
+def get_field_name_list(
+    node: FieldNode, fragments: dict[str, FragmentDefinitionNode] = None, variables: dict = None
+) -> list[str]:
+    """Dotted snake_case names of the requested leaf fields. Aliases and meta fields are ignored, so equal selections
+    give equal names."""
+    names = []
+    for sub_field in iterate_selected_fields(node.selection_set, fragments, variables):
         if sub_field.selection_set:
-            names += get_field_name_list(sub_field)
+            names += get_field_name_list(sub_field, fragments, variables)
         else:
             names.append(camel_to_snake(sub_field.name.value))
 
@@ -24,14 +55,11 @@ def get_request_context(info: ResolveInfo) -> RequestContext:
     return info.context["request"].scope[RequestScopeKeys.CONTEXT]
 
 
-def create_json_serializable_data(data):
-    if isinstance(data, list):
-        return [create_json_serializable_data(val) for val in data]
-    elif isinstance(data, dict):
-        return {key: create_json_serializable_data(val) for key, val in data.items()}
-    elif isinstance(data, BaseModel):
-        return data.model_dump()
-    elif isinstance(data, ObjectType):
-        return data.__dict__
-    else:
-        return data
+def is_read_only_operation(info: ResolveInfo) -> bool:
+    return info.operation.operation != OperationType.MUTATION
+
+
+def get_node_class(field: GraphQLField) -> type | None:
+    """The NodeBase subclass resolving the field, NodeBase.field() sets its bound _resolve classmethod as resolver"""
+    node_class = getattr(field.resolve, "__self__", None)
+    return node_class if isinstance(node_class, type) and hasattr(node_class, "config") else None
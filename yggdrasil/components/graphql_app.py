@@ -0,0 +1,309 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from inspect import isawaitable
+from time import perf_counter
+from typing import Type
+
+import orjson
+from graphql import DocumentNode, ExecutionResult, GraphQLError, OperationType, ValidationRule, execute
+from graphql.utilities import get_operation_ast
+from redis.exceptions import RedisError
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.websockets import WebSocket
+from starlette_graphene3 import GQL_ERROR, GraphQLApp, _get_operation_from_request
+
+from yggdrasil.components.app_config import SlowOperationLogConfig
+from yggdrasil.components.cache import RequestCache
+from yggdrasil.components.database import LazySession
+from yggdrasil.components.document_cache import DocumentCache, DocumentValidationError
+from yggdrasil.components.json_response import OrjsonResponse, StreamingOrjsonResponse, has_long_list
+from yggdrasil.components.persisted_queries import PersistedQueryError, PersistedQueryStore
+from yggdrasil.components.request_context import RequestContext
+from yggdrasil.components.request_context_middleware import request_database_sessions
+from yggdrasil.components.response_cache import ResponseCache, get_operation_digest, get_response_version
+from yggdrasil.components.types import RequestScopeKeys
+
+logger = logging.getLogger(__name__)
+
+
+def get_operation_from_query_params(request: Request) -> dict:
+    operation = {"query": request.query_params.get("query"), "operationName": request.query_params.get("operationName")}
+
+    for name in ["variables", "extensions"]:
+        if value := request.query_params.get(name):
+            try:
+                operation[name] = orjson.loads(value)
+            except orjson.JSONDecodeError:
+                raise ValueError(f"'{name}' is not a valid JSON")
+
+    return operation
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags or "*" in tags
+
+
+@dataclass
+class ParsedOperation:
+    """An operation with its persisted query resolved and its document parsed and validated, or the errors of it"""
+
+    operation: dict
+    document: DocumentNode | None = None
+    errors: list[GraphQLError] | None = None
+
+    @property
+    def type(self) -> OperationType | None:
+        if self.document is None:
+            return None
+        operation_ast = get_operation_ast(self.document, self.operation.get("operationName"))
+        return operation_ast.operation if operation_ast else None
+
+
+class LoggedGraphQLApp(GraphQLApp):
+    MAX_BATCH_SIZE = 20
+
+    def __init__(
+        self,
+        *args,
+        persisted_queries: PersistedQueryStore,
+        response_cache: ResponseCache = None,
+        validation_rules: list[Type[ValidationRule]] = None,
+        slow_operation_log: SlowOperationLogConfig = None,
+        streaming_min_items: int = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.streaming_min_items = streaming_min_items
+        self.slow_operation_log = slow_operation_log or SlowOperationLogConfig()
+        self.persisted_queries = persisted_queries
+        self.document_cache = DocumentCache(self.schema.graphql_schema, validation_rules)
+        self.response_cache = response_cache
+        self.response_version = get_response_version(self.schema.graphql_schema)
+
+    async def _handle_http_request(self, request: Request) -> Response:
+        start = perf_counter()
+
+        try:
+            operations = await _get_operation_from_request(request)
+        except ValueError as e:
+            return OrjsonResponse({"errors": [e.args[0]]}, status_code=400)
+
+        if isinstance(operations, list):
+            response = await self._handle_batch(request, operations)
+        else:
+            response = await self._handle_operation(request, operations, stream=True)
+            operations = [operations]
+
+        self._log_slow_operations(operations, (perf_counter() - start) * 1000)
+        return response
+
+    def _log_slow_operations(self, operations: list, milliseconds: float):
+        """Log a sample of the slow requests, the per node timings are in the resolver_seconds metric"""
+        config = self.slow_operation_log
+        if milliseconds < config.threshold_ms or random.random() >= config.sample_rate:
+            return
+
+        for operation in operations:
+            if isinstance(operation, dict):
+                logger.warning(
+                    "Slow operation: %s ms, operation name: %s, query string: %s",
+                    round(milliseconds, 2),
+                    operation.get("operationName"),
+                    operation.get("query"),
+                )
+
+    async def _handle_batch(self, request: Request, operations: list) -> Response:
+        """Execute the operations of the batch in one request context: the queries concurrently, the mutations one by
+        one in their original order"""
+        if not operations or len(operations) > self.MAX_BATCH_SIZE:
+            return OrjsonResponse(
+                {"errors": [f"A batch must contain 1 to {self.MAX_BATCH_SIZE} operations"]}, status_code=400
+            )
+
+        responses: list[Response | None] = [None] * len(operations)
+        parsed_operations: list[ParsedOperation | None] = [None] * len(operations)
+        queries: list[int] = []
+
+        async def run_queries():
+            results = await asyncio.gather(
+                *[self._handle_parsed_operation(request, parsed_operations[index]) for index in queries]
+            )
+            for index, response in zip(queries, results):
+                responses[index] = response
+            queries.clear()
+
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                responses[index] = OrjsonResponse({"errors": ["Operation must be an object"]})
+                continue
+
+            parsed_operation = await self._parse_operation(operation)
+            if isinstance(parsed_operation, Response):
+                responses[index] = parsed_operation
+            elif parsed_operation.type == OperationType.MUTATION:
+                await run_queries()
+                responses[index] = await self._handle_parsed_operation(request, parsed_operation)
+            else:
+                parsed_operations[index] = parsed_operation
+                queries.append(index)
+
+        await run_queries()
+
+        return Response(b"[" + b",".join(response.body for response in responses) + b"]", media_type="application/json")
+
+    async def _parse_operation(self, operation: dict) -> ParsedOperation | Response:
+        """Resolve the persisted query of the operation and parse its document, once per operation"""
+        try:
+            operation = await self.persisted_queries.resolve(operation)
+        except PersistedQueryError as e:
+            return OrjsonResponse({"errors": [e.formatted]})
+
+        query = operation.get("query")
+        if not isinstance(query, str):
+            return ParsedOperation(operation, errors=[GraphQLError("Must provide query string.")])
+
+        try:
+            document = self.document_cache.get(query)
+        except DocumentValidationError as e:
+            return ParsedOperation(operation, errors=e.errors)
+
+        await self.persisted_queries.register_operation(operation)
+        return ParsedOperation(operation, document)
+
+    async def _ws_on_start(self, data, operation_id: str, websocket: WebSocket, subscriptions: dict):
+        """The operations over websocket are checked with the validation rules of the app too"""
+        if isinstance(data, dict) and isinstance(query := data.get("query"), str):
+            try:
+                self.document_cache.get(query)
+            except DocumentValidationError as e:
+                payload = self.error_formatter(e.errors[0])
+                await websocket.send_json({"type": GQL_ERROR, "id": operation_id, "payload": payload})
+                return
+
+        # the messages of the connection are handled one by one, the queries and mutations are done when the start
+        # message is handled, so their database connection is not held while the connection is idle
+        request_context: RequestContext = websocket.scope[RequestScopeKeys.CONTEXT]
+        websocket.scope[RequestScopeKeys.REQUEST_CACHE] = request_cache = RequestCache(request_context.cache)
+        websocket.scope[RequestScopeKeys.DATABASE_SESSION] = database_session = LazySession(request_context.db)
+        try:
+            await super()._ws_on_start(data, operation_id, websocket, subscriptions)
+        finally:
+            await database_session.close()
+            await request_cache.flush()
+
+        request_database_sessions.inc("opened" if database_session.opened else "avoided")
+
+    async def _get_on_get(self, request: Request) -> Response | None:
+        if "query" not in request.query_params and "extensions" not in request.query_params:
+            return await super()._get_on_get(request)
+
+        try:
+            operation = get_operation_from_query_params(request)
+        except ValueError as e:
+            return OrjsonResponse({"errors": [e.args[0]]}, status_code=400)
+
+        return await self._handle_operation(request, operation, query_only=True, stream=True)
+
+    async def _get_operation_digest(self, request: Request, operation: dict) -> str | None:
+        request_context: RequestContext = request.scope[RequestScopeKeys.CONTEXT]
+        if not request_context.cache.enabled or not isinstance(operation.get("query"), str):
+            return None
+
+        # multipart operations carry uploaded files
+        if request.method == "POST" and not request.headers.get("Content-Type", "").startswith("application/json"):
+            return None
+
+        user = request_context.auth.get_user(request)
+        try:
+            return await get_operation_digest(
+                request_context.cache, operation, user.id if user else None, self.response_version
+            )
+        except RedisError:
+            logger.exception("Unable to fetch the data generations")
+            return None
+
+    async def _handle_operation(
+        self, request: Request, operation: dict, query_only: bool = False, stream: bool = False
+    ) -> Response:
+        parsed_operation = await self._parse_operation(operation)
+        if isinstance(parsed_operation, Response):
+            return parsed_operation
+        return await self._handle_parsed_operation(request, parsed_operation, query_only, stream)
+
+    async def _handle_parsed_operation(
+        self, request: Request, parsed_operation: ParsedOperation, query_only: bool = False, stream: bool = False
+    ) -> Response:
+        operation = parsed_operation.operation
+        if query_only and parsed_operation.type not in (OperationType.QUERY, None):
+            return OrjsonResponse({"errors": ["Only query operations are allowed over GET"]}, status_code=405)
+
+        digest = None
+        if query_only or self.response_cache:
+            digest = await self._get_operation_digest(request, operation)
+
+        headers = {}
+        if digest and query_only:
+            headers = {"ETag": f'"{digest}"', "Cache-Control": "private, no-cache"}
+            if etag_matches(request.headers.get("If-None-Match"), headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+
+        cache_key = None
+        if digest and self.response_cache:
+            cache_key = self.response_cache.get_key(digest)
+            if (body := await self.response_cache.get(cache_key)) is not None:
+                return Response(body, media_type="application/json", headers=headers)
+
+        context_value = await self._get_context_value(request)
+        result = await self._execute(parsed_operation, context_value)
+
+        # the response cache needs the whole body
+        response = self._create_response(result, context_value, stream and not cache_key)
+
+        if result.errors or parsed_operation.type != OperationType.QUERY:
+            return response
+
+        response.headers.update(headers)
+        if cache_key:
+            await self.response_cache.set(cache_key, response.body)
+
+        return response
+
+    async def _execute(self, parsed_operation: ParsedOperation, context_value) -> ExecutionResult:
+        if parsed_operation.errors:
+            return ExecutionResult(None, parsed_operation.errors)
+
+        operation = parsed_operation.operation
+        result = execute(
+            self.schema.graphql_schema,
+            parsed_operation.document,
+            root_value=self.root_value,
+            context_value=context_value,
+            variable_values=operation.get("variables"),
+            operation_name=operation.get("operationName"),
+            middleware=self.middleware,
+            execution_context_class=self.execution_context_class,
+        )
+        if isawaitable(result):
+            result = await result
+
+        return result
+
+    def _create_response(self, result: ExecutionResult, context_value, stream: bool = False) -> Response:
+        response = {"data": result.data}
+        if result.errors:
+            for error in result.errors:
+                if error.original_error:
+                    self.logger.error("An exception occurred in resolvers", exc_info=error.original_error)
+            response["errors"] = [self.error_formatter(error) for error in result.errors]
+
+        background = context_value.get("background")
+        if stream and self.streaming_min_items and has_long_list(result.data, self.streaming_min_items):
+            return StreamingOrjsonResponse(response, self.streaming_min_items, background=background)
+
+        return OrjsonResponse(response, status_code=200, background=background)
@@ -0,0 +1,67 @@
+from typing import Iterator
+
+import orjson
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, StreamingResponse
+
+from .cache_codec import serialize_default
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def dumps(content) -> bytes:
+    """orjson handles the enums and datetimes natively, and the pydantic models via serialize_default"""
+    return orjson.dumps(content, default=serialize_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def _iter_parts(content, min_items: int) -> Iterator[bytes]:
+    if isinstance(content, dict):
+        yield b"{"
+        for index, (key, value) in enumerate(content.items()):
+            yield (b"," if index else b"") + dumps(str(key)) + b":"
+            yield from _iter_parts(value, min_items)
+        yield b"}"
+    elif isinstance(content, list) and len(content) >= min_items:
+        yield b"["
+        for index, item in enumerate(content):
+            if index:
+                yield b","
+            yield from _iter_parts(item, min_items)
+        yield b"]"
+    else:
+        yield dumps(content)
+
+
+def iter_json(content, min_items: int, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode the content piece by piece, the lists with at least min_items items are encoded item by item, so the
+    encoded document is never held in memory as a whole"""
+    buffer = bytearray()
+    for part in _iter_parts(content, min_items):
+        buffer += part
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def has_long_list(content: dict | None, min_items: int) -> bool:
+    return any(isinstance(value, list) and len(value) >= min_items for value in (content or {}).values())
+
+
+class StreamingOrjsonResponse(StreamingResponse):
+    def __init__(
+        self,
+        content,
+        min_items: int,
+        status_code: int = 200,
+        headers: dict = None,
+        background: BackgroundTask = None,
+    ):
+        # the sync iterator is consumed in the threadpool, the encoding does not block the event loop
+        super().__init__(iter_json(content, min_items), status_code, headers, "application/json", background)
@@ -0,0 +1,158 @@
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _format_labels(label_names: tuple[str, ...], label_values: tuple[str, ...], extra: dict = None) -> str:
+    pairs = list(zip(label_names, label_values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+@dataclass
+class Counter:
+    name: str
+    description: str
+    label_names: tuple[str, ...] = ()
+    values: dict[tuple[str, ...], float] = field(default_factory=dict)
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self.values.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for label_values, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {value}")
+        return lines
+
+
+@dataclass
+class _HistogramSeries:
+    bucket_counts: list[int]
+    count: int = 0
+    sum: float = 0
+
+
+@dataclass
+class Histogram:
+    name: str
+    description: str
+    label_names: tuple[str, ...] = ()
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    series: dict[tuple[str, ...], _HistogramSeries] = field(default_factory=dict)
+
+    def observe(self, value: float, *label_values: str):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = _HistogramSeries([0] * len(self.buckets))
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series.bucket_counts[index] += 1
+        series.count += 1
+        series.sum += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for label_values, series in self.series.items():
+            cumulative = 0
+            for bucket, count in zip(self.buckets, series.bucket_counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, {"le": bucket})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values, {"le": "+Inf"})
+            lines.append(f"{self.name}_bucket{labels} {series.count}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_count{labels} {series.count}")
+            lines.append(f"{self.name}_sum{labels} {series.sum}")
+        return lines
+
+
+@dataclass
+class _SummarySeries:
+    samples: deque
+    count: int = 0
+    sum: float = 0
+
+
+@dataclass
+class Summary:
+    """Quantiles of the last `window` observations of each series"""
+
+    name: str
+    description: str
+    label_names: tuple[str, ...] = ()
+    quantiles: tuple[float, ...] = (0.5, 0.95, 0.99)
+    window: int = 1000
+    series: dict[tuple[str, ...], _SummarySeries] = field(default_factory=dict)
+
+    def observe(self, value: float, *label_values: str):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = _SummarySeries(deque(maxlen=self.window))
+        series.samples.append(value)
+        series.count += 1
+        series.sum += value
+
+    def get_quantile(self, quantile: float, *label_values: str) -> float | None:
+        series = self.series.get(label_values)
+        if series is None or not series.samples:
+            return None
+        samples = sorted(series.samples)
+        return samples[min(int(quantile * len(samples)), len(samples) - 1)]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} summary"]
+        for label_values, series in self.series.items():
+            for quantile in self.quantiles:
+                labels = _format_labels(self.label_names, label_values, {"quantile": quantile})
+                lines.append(f"{self.name}{labels} {self.get_quantile(quantile, *label_values)}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_count{labels} {series.count}")
+            lines.append(f"{self.name}_sum{labels} {series.sum}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "yggdrasil_"):
+        self._prefix = prefix
+        self._metrics: dict[str, Counter | Histogram | Summary] = {}
+
+    def counter(self, name: str, description: str, label_names: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(self._prefix + name, description, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(self._prefix + name, description, label_names, buckets))
+
+    def summary(self, name: str, description: str, label_names: tuple[str, ...] = ()) -> Summary:
+        return self._register(Summary(self._prefix + name, description, label_names))
+
+    def _register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+    async def endpoint(self, request: Request):
+        return PlainTextResponse(self.render(), media_type="text/plain; version=0.0.4")
+
+
+registry = MetricsRegistry()
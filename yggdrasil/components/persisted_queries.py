@@ -0,0 +1,188 @@
+import logging
+from datetime import timedelta
+from hashlib import sha256
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    NameNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    Visitor,
+    parse,
+    print_ast,
+    visit,
+)
+from redis.exceptions import RedisError
+
+from yggdrasil.components.cache import Cache
+
+logger = logging.getLogger(__name__)
+
+
+class PersistedQueryError(Exception):
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+    @property
+    def formatted(self) -> dict:
+        return {"message": self.message, "extensions": {"code": self.code}}
+
+
+def get_persisted_query_extension(operation: dict) -> dict | None:
+    """The persistedQuery extension of the operation, the extensions are sent by the client and may be of any type"""
+    extensions = operation.get("extensions")
+    if extensions is None:
+        return None
+    if not isinstance(extensions, dict):
+        raise PersistedQueryError("extensions must be an object", "BAD_REQUEST")
+
+    persisted_query = extensions.get("persistedQuery")
+    if not persisted_query:
+        return None
+    if not isinstance(persisted_query, dict) or not isinstance(persisted_query.get("sha256Hash"), str):
+        raise PersistedQueryError("persistedQuery must be an object with a sha256Hash string", "BAD_REQUEST")
+    return persisted_query
+
+
+class PersistedQueryStore:
+    """Redis backed store of the Automatic Persisted Queries: clients may send the sha256 hash of a known document
+    instead of the document itself"""
+
+    KEY_PREFIX = "apq"
+    LOCAL_EXPIRY = timedelta(hours=1)
+    # the clients send the document again once it expires, the operations of the frontend are registered on deploy
+    # without expiry
+    EXPIRY = timedelta(days=7)
+
+    def __init__(self, cache: Cache):
+        self.cache = cache
+
+    @staticmethod
+    def get_hash(query: str) -> str:
+        return sha256(query.encode()).hexdigest()
+
+    @classmethod
+    def get_key(cls, query_hash: str) -> str:
+        return f"{cls.KEY_PREFIX}:{query_hash}"
+
+    async def get(self, query_hash: str) -> str | None:
+        key = self.get_key(query_hash)
+        if (query := self.cache.local.get(key)) is not None:
+            return query
+
+        try:
+            raw_query = await self.cache.redis.get(key)
+        except RedisError:
+            logger.exception("Unable to fetch persisted query %s", query_hash)
+            return None
+
+        if raw_query is None:
+            return None
+
+        query = raw_query.decode()
+        self.cache.local.set(key, query, len(raw_query), self.LOCAL_EXPIRY)
+        return query
+
+    async def register(self, query: str) -> str:
+        query_hash = self.get_hash(query)
+        key = self.get_key(query_hash)
+        try:
+            await self.cache.redis.set(key, query, ex=self.EXPIRY)
+        except RedisError:
+            logger.exception("Unable to store persisted query %s", query_hash)
+            return query_hash
+
+        self.cache.local.set(key, query, len(query), self.LOCAL_EXPIRY)
+        return query_hash
+
+    async def register_operation(self, operation: dict):
+        """Store the query of the operation if the client asked for it. Called only with the queries already parsed
+        and validated, so the store cannot be filled with arbitrary data."""
+        if not get_persisted_query_extension(operation) or not self.cache.enabled:
+            return
+
+        query = operation["query"]
+        # known already, fetched from or registered to the store recently
+        if self.cache.local.get(self.get_key(self.get_hash(query))) is not None:
+            return
+
+        await self.register(query)
+
+    async def resolve(self, operation: dict) -> dict:
+        """Fill the query of the operation from the store if the client sent only the hash of it. The query sent with
+        its hash is checked only, it is registered once it is validated."""
+        persisted_query = get_persisted_query_extension(operation)
+        if not persisted_query:
+            return operation
+
+        if not self.cache.enabled:
+            raise PersistedQueryError("PersistedQueryNotSupported", "PERSISTED_QUERY_NOT_SUPPORTED")
+
+        query_hash = persisted_query["sha256Hash"]
+
+        if query := operation.get("query"):
+            # the query of another type is reported when the operation is parsed
+            if isinstance(query, str) and self.get_hash(query) != query_hash:
+                raise PersistedQueryError("provided sha does not match query", "INVALID_SHA256_HASH")
+            return operation
+
+        if (query := await self.get(query_hash)) is None:
+            raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+
+        return {**operation, "query": query}
+
+
+class _TypenameAdder(Visitor):
+    def enter_selection_set(self, node: SelectionSetNode, key, parent, path, ancestors):
+        if isinstance(parent, OperationDefinitionNode):
+            return None
+        if isinstance(parent, FieldNode) and parent.name.value.startswith("__"):
+            return None
+        if any(
+            isinstance(selection, FieldNode) and selection.name.value == "__typename" for selection in node.selections
+        ):
+            return None
+        typename = FieldNode(name=NameNode(value="__typename"), arguments=(), directives=())
+        return SelectionSetNode(selections=(*node.selections, typename))
+
+
+class _FragmentSpreadCollector(Visitor):
+    def __init__(self):
+        super().__init__()
+        self.names = set()
+
+    def enter_fragment_spread(self, node: FragmentSpreadNode, *args):
+        self.names.add(node.name.value)
+
+
+def _collect_fragments(node, fragments: dict[str, FragmentDefinitionNode], collected: dict):
+    collector = _FragmentSpreadCollector()
+    visit(node, collector)
+    for name in sorted(collector.names - collected.keys()):
+        collected[name] = fragments[name]
+        _collect_fragments(fragments[name], fragments, collected)
+    return collected
+
+
+def get_client_documents(source: str) -> dict[str, str]:
+    """Split a document into the per operation documents exactly as the Apollo client sends them: with __typename
+    added to every selection set and the used fragments appended, so their hashes match the ones of the client"""
+    document = visit(parse(source), _TypenameAdder())
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+    documents = {}
+    for definition in document.definitions:
+        if not isinstance(definition, OperationDefinitionNode):
+            continue
+        used_fragments = _collect_fragments(definition, fragments, {})
+        documents[definition.name.value] = print_ast(DocumentNode(definitions=(definition, *used_fragments.values())))
+    return documents
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, ColumnElement, Integer, Table, Update, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+MIN_RANK_GAP = 1e-9
+
+
+def get_rank_between(before: float | None, after: float | None) -> float | None:
+    """The rank of an item placed between its neighbours, None when their ranks are too close to be split"""
+    if before is None and after is None:
+        return 0.0
+    if before is None:
+        return after - 1
+    if after is None:
+        return before + 1
+    if after - before < MIN_RANK_GAP:
+        return None
+    return (before + after) / 2
+
+
+def get_rebalance_query(table: Table, partition_by: list[Column], where: ColumnElement = None) -> Update:
+    """Renumber the ranks of every list to consecutive integers. Only the rows out of place are written, so it is
+    cheap on lists that are already balanced."""
+    position = func.row_number().over(partition_by=partition_by, order_by=[table.c.rank, table.c.id]) - 1
+    numbered = select(table.c.id, position.label("position"))
+    if where is not None:
+        numbered = numbered.where(where)
+    numbered = numbered.subquery()
+
+    return (
+        update(table)
+        .where(table.c.id == numbered.c.id, table.c.rank != numbered.c.position)
+        .values(rank=numbered.c.position)
+    )
+
+
+def get_ranks_update_query(table: Table, ids: list[int]) -> Update:
+    """Set the rank of the items to their position in the ids with a single statement, joined against the unnested
+    array of the ids"""
+    positions = (
+        func.unnest(literal(ids, ARRAY(Integer))).table_valued("id", with_ordinality="position").render_derived()
+    )
+    return update(table).where(table.c.id == positions.c.id).values(rank=positions.c.position - 1)
@@ -5,7 +5,6 @@ from dataclasses import dataclass
 from fake_useragent import UserAgent
 from httpx import AsyncClient
 from pydantic import BaseModel
-import asyncpraw
 
 from yggdrasil.components.app_config import ReditConfig
 
@@ -70,6 +69,9 @@ def get_earth_porn_images_old(subreddit_json: dict):
 
 
 async def get_earth_porn_images(config: ReditConfig):
+    # imported here as it takes a third of the startup time of the workers
+    import asyncpraw
+
     reddit = asyncpraw.Reddit(
         client_id=config.client_id,
         client_secret=config.client_secret,
@@ -5,7 +5,9 @@ from redis import Redis
 if TYPE_CHECKING:
     from yggdrasil.auth_controller import AuthController
     from yggdrasil.components.app_config import AppConfig
+    from yggdrasil.components.cache import Cache
     from yggdrasil.components.database import Database
+    from yggdrasil.components.event_bus import EventBus
 
 
 @dataclass
@@ -14,3 +16,5 @@ class RequestContext:
     auth: "AuthController"
     config: "AppConfig"
     redis: "Redis"
+    cache: "Cache"
+    events: "EventBus"
@@ -1,9 +1,17 @@
 from starlette.types import ASGIApp, Scope, Receive, Send
 
+from yggdrasil.components.cache import RequestCache
+from yggdrasil.components.database import LazySession
+from yggdrasil.components.metrics import registry
 from yggdrasil.components.request_context import RequestContext
 from yggdrasil.components.types import RequestScopeKeys
 
 
+request_database_sessions = registry.counter(
+    "request_database_sessions_total", "Requests by whether they opened a database session", ("session",)
+)
+
+
 class RequestContextMiddleware:
     def __init__(self, app: ASGIApp, context_data: RequestContext):
         self.app = app
@@ -12,6 +20,19 @@ class RequestContextMiddleware:
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         scope[RequestScopeKeys.CONTEXT] = self._context_data
 
-        async with self._context_data.db.session() as session:
-            scope[RequestScopeKeys.DATABASE_SESSION] = session
+        # the websocket operations get a request cache and a database session each, released when the operation is done,
+        # as the scope of a websocket lives as long as the connection
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope[RequestScopeKeys.REQUEST_CACHE] = request_cache = RequestCache(self._context_data.cache)
+        scope[RequestScopeKeys.DATABASE_SESSION] = database_session = LazySession(self._context_data.db)
+
+        try:
             await self.app(scope, receive, send)
+        finally:
+            await database_session.close()
+            await request_cache.flush()
+
+        request_database_sessions.inc("opened" if database_session.opened else "avoided")
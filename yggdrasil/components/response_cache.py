@@ -0,0 +1,96 @@
+import importlib.metadata
+import logging
+from datetime import timedelta
+from hashlib import blake2b, sha256
+
+import orjson
+from graphql import GraphQLSchema, print_schema
+from redis.exceptions import RedisError
+
+from yggdrasil.components import cache_codec
+from yggdrasil.components.cache import Cache, GENERATION_TAG, GLOBAL_SCOPE_KEY, get_tag_key, get_user_scope_key
+from yggdrasil.components.cache_codec import CacheCodecError
+from yggdrasil.components.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+response_cache_hits = registry.counter("response_cache_hits_total", "GraphQL responses served from the response cache")
+response_cache_misses = registry.counter("response_cache_misses_total", "GraphQL responses not found in the cache")
+
+
+def get_response_version(schema: GraphQLSchema) -> str:
+    """Changes with every release and schema change, so the responses of a previous deploy are neither served from the
+    cache nor accepted as a valid ETag"""
+    try:
+        version = importlib.metadata.version("yggdrasil")
+    except importlib.metadata.PackageNotFoundError:
+        # running from the source tree
+        version = ""
+    return blake2b((version + print_schema(schema)).encode(), digest_size=8).hexdigest()
+
+
+async def get_operation_digest(cache: Cache, operation: dict, user_id: int | None, response_version: str) -> str:
+    """Digest of the operation and of the data it could read: it changes whenever the user (or global) data changes,
+    and with the response version of the app"""
+    scope_keys = [GLOBAL_SCOPE_KEY] + ([get_user_scope_key(user_id)] if user_id else [])
+    generations = await cache.get_tag_versions([get_tag_key(key, GENERATION_TAG) for key in scope_keys])
+    document_hash = sha256(operation["query"].encode()).hexdigest()
+    key_data = orjson.dumps(
+        [
+            response_version,
+            document_hash,
+            operation.get("variables"),
+            operation.get("operationName"),
+            user_id,
+            generations,
+        ],
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return blake2b(key_data, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Stores the serialized responses of whole query operations.
+
+    The key contains the data generations of the user and of the global scope, so any mutation of the user (or
+    refresh of global data) makes the previously cached responses unreachable, just like a deploy of a new version.
+    """
+
+    def __init__(self, cache: Cache, expiry: timedelta):
+        self.cache = cache
+        self.expiry = expiry
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache.enabled
+
+    @staticmethod
+    def get_key(operation_digest: str) -> str:
+        return f"response:{operation_digest}"
+
+    async def get(self, key: str) -> bytes | None:
+        if (body := self.cache.local.get(key)) is None:
+            try:
+                raw_data = await self.cache.redis.get(key)
+                body = cache_codec.unpack(raw_data) if raw_data is not None else None
+            except (RedisError, CacheCodecError):
+                logger.exception("Unable to fetch cached response for %s", key)
+                return None
+
+            if body is not None:
+                self.cache.local.set(key, body, len(body), self.expiry)
+
+        if body is None:
+            response_cache_misses.inc()
+        else:
+            response_cache_hits.inc()
+        return body
+
+    async def set(self, key: str, body: bytes):
+        try:
+            await self.cache.redis.set(key, cache_codec.pack(body), self.expiry)
+        except RedisError:
+            logger.exception("Unable to store response for %s", key)
+            return
+
+        self.cache.local.set(key, body, len(body), self.expiry)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from time import monotonic, time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from pydantic import BaseModel
+from redis import Redis
+from redis.exceptions import RedisError
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(BaseModel):
+    name: str
+    interval: float
+    runs: int = 0
+    failures: int = 0
+    last_run: datetime | None = None
+    last_duration: float | None = None
+    last_error: str | None = None
+    next_run: datetime | None = None
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], Awaitable]
+    interval: timedelta
+    jitter: timedelta = timedelta()
+    status: JobStatus = None
+    next_run_at: float = 0
+
+    def __post_init__(self):
+        self.status = JobStatus(name=self.name, interval=self.interval.total_seconds())
+
+    def schedule_next_run(self, delay: timedelta):
+        delay_seconds = delay.total_seconds() + random.uniform(0, self.jitter.total_seconds())
+        self.set_next_run_at(time() + delay_seconds)
+
+    def set_next_run_at(self, next_run_at: float):
+        """The time of the next run is a timestamp, as it is shared with the other workers"""
+        self.next_run_at = next_run_at
+        self.status.next_run = datetime.fromtimestamp(next_run_at)
+
+
+@dataclass
+class Scheduler:
+    """Runs periodic jobs in the background. Only the worker holding the leader lock runs them."""
+
+    redis: Redis | None
+    leader_lock_timeout: timedelta = timedelta(minutes=1)
+    tick_interval: timedelta = timedelta(seconds=1)
+    worker_id: str = field(default_factory=lambda: uuid4().hex)
+    jobs: list[ScheduledJob] = field(default_factory=list)
+    is_leader: bool = False
+
+    LEADER_KEY = "scheduler-leader"
+    NEXT_RUN_KEY_PREFIX = "scheduler-next-run"
+
+    def add_job(self, name: str, func: Callable[[], Awaitable], interval: timedelta, jitter: timedelta = timedelta()):
+        self.jobs.append(ScheduledJob(name, func, interval, jitter))
+
+    async def acquire_leadership(self) -> bool:
+        if self.redis is None:
+            return True
+
+        timeout = self.leader_lock_timeout
+        if await self.redis.set(self.LEADER_KEY, self.worker_id, nx=True, ex=timeout):
+            return True
+
+        leader = await self.redis.get(self.LEADER_KEY)
+        if leader is not None and leader.decode() == self.worker_id:
+            await self.redis.expire(self.LEADER_KEY, timeout)
+            return True
+
+        return False
+
+    async def renew_leadership(self):
+        """Keep the leader lock while a job runs, a job running longer than the lock timeout must not be started by
+        another worker meanwhile"""
+        while True:
+            await asyncio.sleep(self.leader_lock_timeout.total_seconds() / 3)
+            try:
+                if not await self.acquire_leadership():
+                    logger.warning("Worker %s lost the scheduler leadership while running a job", self.worker_id)
+            except RedisError:
+                logger.exception("Unable to renew the scheduler leadership")
+
+    def _get_next_run_key(self, job: ScheduledJob) -> str:
+        return f"{self.NEXT_RUN_KEY_PREFIX}:{job.name}"
+
+    async def load_schedule(self):
+        """A new leader continues the schedule of the previous one, only the jobs never run are due right away"""
+        for job in self.jobs:
+            next_run_at = await self.redis.get(self._get_next_run_key(job)) if self.redis is not None else None
+            if next_run_at is None:
+                job.schedule_next_run(timedelta())
+            else:
+                job.set_next_run_at(float(next_run_at))
+
+    async def run_job(self, job: ScheduledJob):
+        start = monotonic()
+        job.status.last_run = datetime.now()
+        renewal = asyncio.create_task(self.renew_leadership()) if self.redis is not None else None
+        try:
+            await job.func()
+            job.status.last_error = None
+        except Exception as e:
+            logger.exception("Scheduled job %s failed", job.name)
+            job.status.failures += 1
+            job.status.last_error = str(e)
+        finally:
+            if renewal is not None:
+                renewal.cancel()
+                await asyncio.gather(renewal, return_exceptions=True)
+        job.status.runs += 1
+        job.status.last_duration = monotonic() - start
+        job.schedule_next_run(job.interval)
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(self._get_next_run_key(job), job.next_run_at)
+            except RedisError:
+                logger.exception("Unable to store the next run of scheduled job %s", job.name)
+
+    async def tick(self):
+        is_leader = await self.acquire_leadership()
+        if is_leader and not self.is_leader:
+            logger.info("Worker %s became the scheduler leader", self.worker_id)
+            await self.load_schedule()
+        self.is_leader = is_leader
+
+        if not self.is_leader:
+            return
+
+        for job in self.jobs:
+            if job.next_run_at <= time():
+                await self.run_job(job)
+
+    async def run(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            await asyncio.sleep(self.tick_interval.total_seconds())
+
+    async def status_endpoint(self, request: Request):
+        return JSONResponse(
+            {
+                "worker_id": self.worker_id,
+                "is_leader": self.is_leader,
+                "jobs": [job.status.model_dump(mode="json") for job in self.jobs],
+            }
+        )
@@ -1,3 +1,6 @@
 class RequestScopeKeys:
     CONTEXT = "CONTEXT"
     DATABASE_SESSION = "DATABASE_SESSION"
+    CACHE_REFRESH = "CACHE_REFRESH"
+    REQUEST_CACHE = "REQUEST_CACHE"
+    DATA_LOADERS = "DATA_LOADERS"
@@ -1,10 +1,16 @@
+import logging
+
 from pydantic import BaseModel
+from redis.exceptions import RedisError
 from sqlalchemy import select, update, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from yggdrasil.components.cache import Cache, GENERATION_TAG, get_tag_key, get_user_scope_key
 from yggdrasil.db_tables import user
 from yggdrasil.schema import BoardBackgroundType
 
+logger = logging.getLogger(__name__)
+
 
 class UserInfo(BaseModel):
     sub: str
@@ -23,7 +29,7 @@ class UserInfo(BaseModel):
             names.reverse()
         return " ".join(names)
 
-    async def store(self, session: AsyncSession):
+    async def store(self, session: AsyncSession, cache: Cache = None):
         user_data = (await session.execute(select(user).where(user.c.sub == self.sub))).first()
 
         model_data = self.model_dump(exclude_none=True)
@@ -42,3 +48,10 @@ class UserInfo(BaseModel):
             self.id = result.scalar()
 
         await session.commit()
+
+        if user_data and cache is not None and cache.enabled:
+            # the name and the picture may have changed, the cached responses of the user are outdated
+            try:
+                await cache.invalidate_tags([get_tag_key(get_user_scope_key(self.id), GENERATION_TAG)])
+            except RedisError:
+                logger.exception("Unable to invalidate the cache of user %s", self.id)
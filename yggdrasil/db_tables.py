@@ -1,4 +1,4 @@
-from sqlalchemy import MetaData, Table, Column, Integer, String, ForeignKey, Enum
+from sqlalchemy import MetaData, Table, Column, Integer, String, ForeignKey, Enum, Float, Index
 
 from yggdrasil.schema import BoardBackgroundType, LinkType
 
@@ -17,6 +17,7 @@ user = Table(
     Column("picture", String),
     Column("board_background_type", Enum(BoardBackgroundType, native_enum=False)),
     Column("board_background_value", String),
+    Index("ix_user_sub", "sub", unique=True),
 )
 
 section = Table(
@@ -25,7 +26,8 @@ section = Table(
     Column("id", Integer, primary_key=True, autoincrement=True),
     Column("name", String),
     Column("user_id", Integer, ForeignKey("user.id", ondelete="CASCADE")),
-    Column("rank", Integer),
+    Column("rank", Float),
+    Index("ix_section_user_id_rank", "user_id", "rank"),
 )
 
 link = Table(
@@ -36,7 +38,9 @@ link = Table(
     Column("url", String),
     Column("favicon", String),
     Column("section_id", Integer, ForeignKey("section.id", ondelete="CASCADE")),
-    Column("rank", Integer),
+    Column("rank", Float),
     Column("type", Enum(LinkType, native_enum=False), nullable=False),
     Column("link_group_id", Integer, ForeignKey("link.id", ondelete="CASCADE")),
+    Index("ix_link_section_id_rank", "section_id", "rank"),
+    Index("ix_link_link_group_id", "link_group_id"),
 )
@@ -1,12 +1,12 @@
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Section(BaseModel):
     id: int
     name: str
-    rank: int
+    rank: float
 
 
 class LinkType(Enum):
@@ -17,12 +17,20 @@ class LinkType(Enum):
 class Link(BaseModel):
     id: int
     title: str
-    url: str = None
-    favicon: str = None
+    url: str | None = None
+    favicon: str | None = None
     section_id: int
-    rank: int
+    rank: float
     type: LinkType
-    link_group_id: int = None
+    link_group_id: int | None = None
+
+
+class BoardLink(Link):
+    links: list[Link] = Field(default_factory=list)
+
+
+class BoardSection(Section):
+    links: list[BoardLink] = Field(default_factory=list)
 
 
 class BoardBackgroundType(Enum):
@@ -38,3 +46,21 @@ class BoardBackground(BaseModel):
 
 class BoardSettings(BaseModel):
     background: BoardBackground
+
+
+class BoardEventType(Enum):
+    LINK_SAVED = "LINK_SAVED"
+    LINK_DELETED = "LINK_DELETED"
+    LINKS_RANKED = "LINKS_RANKED"
+    SECTION_SAVED = "SECTION_SAVED"
+    SECTION_DELETED = "SECTION_DELETED"
+    SECTIONS_RANKED = "SECTIONS_RANKED"
+    BOARD_SETTINGS_SAVED = "BOARD_SETTINGS_SAVED"
+
+
+class BoardEvent(BaseModel):
+    type: BoardEventType
+    link: Link | None = None
+    section: Section | None = None
+    ids: list[int] = Field(default_factory=list, description="The deleted id, or the ranked ids in their new order")
+    board_settings: BoardSettings | None = None
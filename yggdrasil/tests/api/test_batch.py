@@ -0,0 +1,83 @@
+from hashlib import sha256
+
+import pytest
+
+from yggdrasil.components.persisted_queries import PersistedQueryStore
+
+sections_query = "query Sections { sections { name } }"
+save_section_query = """
+mutation SaveSection($section: SectionInput) {
+    saveSection(section: $section) {
+        errors {
+            msg
+        }
+    }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_batched_queries(test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first")
+
+    result = test_client.post(
+        "/api", json=[{"query": sections_query}, {"query": "{ ping }"}, {"query": "{ whoAmI { id } }"}]
+    ).json()
+
+    assert result == [
+        {"data": {"sections": [{"name": "first"}]}},
+        {"data": {"ping": "pong"}},
+        {"data": {"whoAmI": {"id": authenticated_user.id}}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_mutations_keep_their_order(test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first", rank=0)
+
+    result = test_client.post(
+        "/api",
+        json=[
+            {"query": sections_query},
+            {"query": save_section_query, "variables": {"section": {"name": "second", "rank": 1}}},
+            {"query": sections_query},
+        ],
+    ).json()
+
+    assert result[0]["data"]["sections"] == [{"name": "first"}]
+    assert result[1]["data"]["saveSection"]["errors"] == []
+    assert result[2]["data"]["sections"] == [{"name": "first"}, {"name": "second"}]
+
+
+def test_invalid_operation_in_batch(test_client):
+    result = test_client.post("/api", json=[{"query": "{ ping }"}, "ping"]).json()
+
+    assert result[0] == {"data": {"ping": "pong"}}
+    assert result[1]["errors"] == ["Operation must be an object"]
+
+
+def test_batch_size_limit(test_client):
+    response = test_client.post("/api", json=[{"query": "{ ping }"}] * 21)
+
+    assert response.status_code == 400
+
+
+def test_batched_operations_are_resolved_once(cached_test_client, fake_redis, monkeypatch):
+    query = "query Ping { ping }"
+    fake_redis.data[PersistedQueryStore.get_key(sha256(query.encode()).hexdigest())] = query.encode()
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": sha256(query.encode()).hexdigest()}}
+    resolved = []
+    resolve = PersistedQueryStore.resolve
+
+    async def counted_resolve(self, operation: dict) -> dict:
+        resolved.append(operation)
+        return await resolve(self, operation)
+
+    monkeypatch.setattr(PersistedQueryStore, "resolve", counted_resolve)
+
+    result = cached_test_client.post(
+        "/api/", json=[{"extensions": extensions}, {"query": save_section_query, "variables": {"section": {}}}]
+    ).json()
+
+    assert result[0] == {"data": {"ping": "pong"}}
+    assert len(resolved) == 2
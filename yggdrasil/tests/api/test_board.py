@@ -0,0 +1,93 @@
+import pytest
+
+from yggdrasil.schema import LinkType
+
+board_query = """
+query Board {
+    board {
+        name
+        links {
+            title
+            links {
+                title
+            }
+        }
+    }
+}
+"""
+
+links_by_sections_query = """
+query LinksBySections($first: Int!, $second: Int!) {
+    first: links(sectionId: $first) {
+        title
+    }
+    second: links(sectionId: $second) {
+        title
+    }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_board(test_client, populator, authenticated_user):
+    first = await populator.add_section(authenticated_user.id, name="first", rank=0)
+    await populator.add_section(authenticated_user.id, name="empty", rank=1)
+    group = await populator.add_link(first, title="group", rank=1, type=LinkType.GROUP)
+    await populator.add_link(first, title="child", rank=0, link_group_id=group)
+    await populator.add_link(first, title="single", rank=0)
+
+    result = test_client.query(board_query)
+
+    assert result["data"]["board"] == [
+        {
+            "name": "first",
+            "links": [
+                {"title": "single", "links": []},
+                {"title": "group", "links": [{"title": "child"}]},
+            ],
+        },
+        {"name": "empty", "links": []},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_board_of_other_user_is_not_visible(test_client, populator):
+    async with test_client.authenticate_user() as mulder:
+        await populator.add_section(mulder.id, name="mulder")
+
+    async with test_client.authenticate_user():
+        result = test_client.query(board_query)
+
+    assert result["data"]["board"] == []
+
+
+@pytest.mark.asyncio
+async def test_links_of_sections_loaded_together(test_client, populator, authenticated_user):
+    first = await populator.add_section(authenticated_user.id, rank=0)
+    second = await populator.add_section(authenticated_user.id, rank=1)
+    await populator.add_link(first, title="first")
+    await populator.add_link(second, title="second")
+
+    result = test_client.query(links_by_sections_query, {"first": first, "second": second})
+
+    assert result["data"] == {"first": [{"title": "first"}], "second": [{"title": "second"}]}
+
+
+def test_aliased_fan_out_is_rejected(test_client):
+    fields = " ".join(f"links{index}: links(sectionId: {index}) {{ id }}" for index in range(500))
+
+    result = test_client.query(f"{{ {fields} }}")
+
+    assert result["data"] is None
+    assert "exceeds the maximum" in result["errors"][0]["message"]
+
+
+@pytest.mark.asyncio
+async def test_long_lists_are_streamed(streaming_test_client, populator, authenticated_user):
+    for rank in range(3):
+        await populator.add_section(authenticated_user.id, name=f"section {rank}", rank=rank)
+
+    response = streaming_test_client.post("/api", json={"query": "query Board { board { name } }"})
+
+    assert "content-length" not in response.headers
+    assert response.json() == {"data": {"board": [{"name": "section 0"}, {"name": "section 1"}, {"name": "section 2"}]}}
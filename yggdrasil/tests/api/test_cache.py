@@ -0,0 +1,227 @@
+from pathlib import Path
+
+import pytest
+
+from yggdrasil.api.prewarm import refresh_query, EARTH_PORN_IMAGES_QUERY
+from yggdrasil.api.schema import create_api_schema
+from yggdrasil.auth_controller import AuthController
+from yggdrasil.api.nodes.earth_porn_images import EarthPornImagesNode
+from yggdrasil.components.cache import Cache, CacheEntry, LocalCache
+from yggdrasil.components.event_bus import EventBus
+from yggdrasil.components.graphene.node_base import cache_hits, cache_misses
+from yggdrasil.components.request_context import RequestContext
+from yggdrasil.components.persisted_queries import get_client_documents
+from yggdrasil.components.response_cache import response_cache_hits
+
+sections_query = """
+query Sections { 
+    sections { 
+        id
+        name
+    } 
+}
+"""
+
+board_query = """
+query Board {
+    sections {
+        id
+    }
+    links {
+        id
+    }
+    boardSettings {
+        background {
+            type
+        }
+    }
+}
+"""
+
+save_section_query = """
+mutation SaveSection($section: SectionInput) { 
+    saveSection(section: $section) { 
+        errors { 
+            msg 
+        } 
+    } 
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_sections_served_from_cache(cached_test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first")
+    result = cached_test_client.query(sections_query)
+    assert [s["name"] for s in result["data"]["sections"]] == ["first"]
+
+    await populator.add_section(authenticated_user.id, name="second")
+    result = cached_test_client.query(sections_query)
+    assert [s["name"] for s in result["data"]["sections"]] == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_mutation_invalidates_user_cache(cached_test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first", rank=0)
+    cached_test_client.query(sections_query)
+
+    result = cached_test_client.query(save_section_query, {"section": {"name": "second", "rank": 1}})
+    assert result["data"]["saveSection"]["errors"] == []
+
+    result = cached_test_client.query(sections_query)
+    assert [s["name"] for s in result["data"]["sections"]] == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_cached_fields_share_redis_round_trips(cached_test_client, fake_redis, authenticated_user):
+    mget_calls, executions = fake_redis.mget_calls, fake_redis.pipeline_executions
+
+    result = cached_test_client.query(board_query)
+    assert "errors" not in result
+
+    # one MGET for the tag versions, one MGET + PTTL pipeline for the entries and one pipeline for the writes
+    assert fake_redis.mget_calls == mget_calls + 2
+    assert fake_redis.pipeline_executions == executions + 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_scoped_per_user(cached_test_client, populator):
+    async with cached_test_client.authenticate_user() as mulder:
+        await populator.add_section(mulder.id, name="mulder")
+        cached_test_client.query(sections_query)
+
+    async with cached_test_client.authenticate_user() as scully:
+        await populator.add_section(scully.id, name="scully")
+        result = cached_test_client.query(sections_query)
+        assert [s["name"] for s in result["data"]["sections"]] == ["scully"]
+
+
+@pytest.mark.asyncio
+async def test_prewarm_fills_the_cache(database, app_config, fake_redis):
+    request_context = RequestContext(
+        database,
+        AuthController(app_config),
+        app_config,
+        fake_redis,
+        Cache(fake_redis, LocalCache(100, 10000)),
+        EventBus(fake_redis),
+    )
+
+    await refresh_query(create_api_schema(), request_context, EARTH_PORN_IMAGES_QUERY)
+
+    assert any(key.startswith("EarthPornImagesNode") for key in fake_redis.data)
+
+
+@pytest.mark.asyncio
+async def test_prewarm_fills_the_key_of_the_frontend_query(database, app_config, fake_redis):
+    request_context = RequestContext(
+        database,
+        AuthController(app_config),
+        app_config,
+        fake_redis,
+        Cache(fake_redis, LocalCache(100, 10000)),
+        EventBus(fake_redis),
+    )
+    queries = (Path(__file__).parents[3] / "react-ts" / "src" / "queries.graphql").read_text()
+    # the Apollo client adds __typename to every selection set
+    frontend_query = get_client_documents(queries)["EarthPornImages"]
+    assert "__typename" in frontend_query
+
+    await refresh_query(create_api_schema(), request_context, EARTH_PORN_IMAGES_QUERY)
+    prewarmed_keys = {key for key in fake_redis.data if key.startswith("EarthPornImagesNode")}
+    await refresh_query(create_api_schema(), request_context, frontend_query)
+
+    assert {key for key in fake_redis.data if key.startswith("EarthPornImagesNode")} == prewarmed_keys
+
+
+@pytest.mark.asyncio
+async def test_cache_metrics(cached_test_client, populator, authenticated_user):
+    hits_before = cache_hits.get("SectionsNode")
+    misses_before = cache_misses.get("SectionsNode")
+
+    cached_test_client.query(sections_query)
+    cached_test_client.query(sections_query)
+
+    assert cache_hits.get("SectionsNode") == hits_before + 1
+    assert cache_misses.get("SectionsNode") == misses_before + 1
+
+    metrics = cached_test_client.get("/metrics").text
+    assert 'yggdrasil_node_cache_hits_total{node="SectionsNode"}' in metrics
+    assert 'yggdrasil_node_cache_payload_bytes_count{node="SectionsNode"}' in metrics
+
+
+@pytest.mark.asyncio
+async def test_response_served_without_resolving(response_cached_test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first")
+    response_cached_test_client.query(sections_query)
+    node_hits_before = cache_hits.get("SectionsNode")
+    response_hits_before = response_cache_hits.get()
+
+    await populator.add_section(authenticated_user.id, name="second")
+    result = response_cached_test_client.query(sections_query)
+
+    assert [s["name"] for s in result["data"]["sections"]] == ["first"]
+    assert response_cache_hits.get() == response_hits_before + 1
+    assert cache_hits.get("SectionsNode") == node_hits_before
+
+
+@pytest.mark.asyncio
+async def test_mutation_bumps_response_generation(response_cached_test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first", rank=0)
+    response_cached_test_client.query(sections_query)
+
+    response_cached_test_client.query(save_section_query, {"section": {"name": "second", "rank": 1}})
+
+    result = response_cached_test_client.query(sections_query)
+    assert [s["name"] for s in result["data"]["sections"]] == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_get_query_not_modified(cached_test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first", rank=0)
+
+    response = cached_test_client.get("/api", params={"query": sections_query})
+    assert [s["name"] for s in response.json()["data"]["sections"]] == ["first"]
+    etag = response.headers["ETag"]
+
+    response = cached_test_client.get("/api", params={"query": sections_query}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    cached_test_client.query(save_section_query, {"section": {"name": "second", "rank": 1}})
+
+    response = cached_test_client.get("/api", params={"query": sections_query}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [s["name"] for s in response.json()["data"]["sections"]] == ["first", "second"]
+
+
+def test_get_mutation_not_allowed(cached_test_client):
+    response = cached_test_client.get("/api", params={"query": save_section_query})
+    assert response.status_code == 405
+
+
+def test_get_without_query_serves_graphiql(cached_test_client):
+    response = cached_test_client.get("/api")
+    assert response.headers["Content-Type"].startswith("text/html")
+
+
+@pytest.mark.asyncio
+async def test_data_refreshed_by_another_worker_is_not_resolved_again(cached_test_client, monkeypatch):
+    resolves = []
+
+    async def resolve(self):
+        resolves.append(self)
+        return []
+
+    monkeypatch.setattr(EarthPornImagesNode, "resolve", resolve)
+    query = "query Images { earthPornImages { url } }"
+    assert cached_test_client.query(query) == {"data": {"earthPornImages": []}}
+
+    async def get_stale_data_from_cache(self):
+        return CacheEntry(data=[], fresh_until=0)
+
+    # the worker found a stale entry, and another worker refreshed it before the lock was acquired
+    monkeypatch.setattr(EarthPornImagesNode, "get_data_from_cache", get_stale_data_from_cache)
+
+    assert cached_test_client.query(query) == {"data": {"earthPornImages": []}}
+    assert len(resolves) == 1
@@ -0,0 +1,195 @@
+import pytest
+
+from yggdrasil.api.ranks import rebalance_ranks
+from yggdrasil.api.types import CacheTag
+from yggdrasil.components.cache import Cache, GENERATION_TAG, LocalCache, get_tag_key, get_user_scope_key
+from yggdrasil.components.event_bus import EventBus
+from yggdrasil.schema import BoardEventType
+from yggdrasil.tests.tools import FakeRedis, capture_statements
+
+move_link_query = """
+mutation MoveLink($id: Int!, $beforeId: Int, $afterId: Int) {
+    moveLink(id: $id, beforeId: $beforeId, afterId: $afterId) {
+        errors {
+            msg
+        }
+    }
+}
+"""
+
+move_section_query = """
+mutation MoveSection($id: Int!, $beforeId: Int, $afterId: Int) {
+    moveSection(id: $id, beforeId: $beforeId, afterId: $afterId) {
+        errors {
+            msg
+        }
+    }
+}
+"""
+
+
+def get_order(items) -> list[int]:
+    return [item.id for item in sorted(items, key=lambda item: item.rank)]
+
+
+@pytest.mark.asyncio
+async def test_move_link_updates_only_the_moved_link(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    link1_id = await populator.add_link(section_id, rank=0)
+    link2_id = await populator.add_link(section_id, rank=1)
+    link3_id = await populator.add_link(section_id, rank=2)
+
+    with capture_statements() as statements:
+        result = test_client.query(move_link_query, {"id": link3_id, "beforeId": link1_id, "afterId": link2_id})
+
+    assert result["data"]["moveLink"]["errors"] == []
+    assert len([statement for statement in statements if statement.startswith("UPDATE")]) == 1
+    assert get_order(await populator.list_links(section_ids={section_id})) == [link1_id, link3_id, link2_id]
+
+
+@pytest.mark.asyncio
+async def test_move_link_to_the_ends(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    link1_id = await populator.add_link(section_id, rank=0)
+    link2_id = await populator.add_link(section_id, rank=1)
+    link3_id = await populator.add_link(section_id, rank=2)
+
+    # a single event loop for the requests, the pooled connections are bound to it
+    with test_client:
+        test_client.query(move_link_query, {"id": link3_id, "afterId": link1_id})
+        test_client.query(move_link_query, {"id": link1_id, "beforeId": link2_id})
+
+    assert get_order(await populator.list_links(section_ids={section_id})) == [link3_id, link2_id, link1_id]
+
+
+@pytest.mark.asyncio
+async def test_move_link_rebalances_the_list_of_too_close_ranks(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    other_section_id = await populator.add_section(authenticated_user.id)
+    link1_id = await populator.add_link(section_id, rank=1)
+    link2_id = await populator.add_link(section_id, rank=1 + 1e-12)
+    link3_id = await populator.add_link(section_id, rank=5)
+    other_link_id = await populator.add_link(other_section_id, rank=0.5)
+
+    result = test_client.query(move_link_query, {"id": link3_id, "beforeId": link1_id, "afterId": link2_id})
+
+    assert result["data"]["moveLink"]["errors"] == []
+    links = {link.id: link.rank for link in await populator.list_links()}
+    assert links == {link1_id: 0, link3_id: 0.5, link2_id: 1, other_link_id: 0.5}
+
+
+@pytest.mark.asyncio
+async def test_move_link_publishes_the_renumbered_list(test_client, monkeypatch, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    link1_id = await populator.add_link(section_id, rank=1)
+    link2_id = await populator.add_link(section_id, rank=1 + 1e-12)
+    link3_id = await populator.add_link(section_id, rank=5)
+    events = []
+
+    async def publish(event_bus, channel, event):
+        events.append(event)
+
+    monkeypatch.setattr(EventBus, "publish", publish)
+
+    test_client.query(move_link_query, {"id": link3_id, "beforeId": link1_id, "afterId": link2_id})
+
+    assert [(event.type, event.ids) for event in events] == [
+        (BoardEventType.LINKS_RANKED, [link1_id, link2_id, link3_id]),
+        (BoardEventType.LINK_SAVED, []),
+    ]
+    assert events[1].link.rank == 0.5
+
+
+@pytest.mark.asyncio
+async def test_move_link_without_rebalance_publishes_the_moved_link_only(
+    test_client, monkeypatch, populator, authenticated_user
+):
+    section_id = await populator.add_section(authenticated_user.id)
+    link1_id = await populator.add_link(section_id, rank=0)
+    link2_id = await populator.add_link(section_id, rank=1)
+    events = []
+
+    async def publish(event_bus, channel, event):
+        events.append(event)
+
+    monkeypatch.setattr(EventBus, "publish", publish)
+
+    test_client.query(move_link_query, {"id": link2_id, "afterId": link1_id})
+
+    assert [event.type for event in events] == [BoardEventType.LINK_SAVED]
+
+
+@pytest.mark.asyncio
+async def test_move_link_between_links_of_another_list(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    other_section_id = await populator.add_section(authenticated_user.id)
+    link_id = await populator.add_link(section_id)
+    other_link_id = await populator.add_link(other_section_id)
+
+    result = test_client.query(move_link_query, {"id": link_id, "beforeId": other_link_id})
+
+    assert result["data"]["moveLink"]["errors"][0]["msg"] == "The links must be in the same list"
+
+
+@pytest.mark.asyncio
+async def test_move_link_between_links_in_the_wrong_order(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    link1_id = await populator.add_link(section_id, rank=0)
+    link2_id = await populator.add_link(section_id, rank=1)
+    link3_id = await populator.add_link(section_id, rank=2)
+
+    result = test_client.query(move_link_query, {"id": link3_id, "beforeId": link2_id, "afterId": link1_id})
+
+    assert result["data"]["moveLink"]["errors"][0]["msg"] == "The links are in the wrong order"
+
+
+@pytest.mark.asyncio
+async def test_move_section(test_client, populator, authenticated_user):
+    section1_id = await populator.add_section(authenticated_user.id, rank=0)
+    section2_id = await populator.add_section(authenticated_user.id, rank=1)
+
+    result = test_client.query(move_section_query, {"id": section2_id, "afterId": section1_id})
+
+    assert result["data"]["moveSection"]["errors"] == []
+    sections = await populator.list_sections(user_id=authenticated_user.id)
+    assert get_order(sections) == [section2_id, section1_id]
+
+
+@pytest.mark.asyncio
+async def test_rebalance_ranks(database, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    link1_id = await populator.add_link(section_id, rank=-3.5)
+    link2_id = await populator.add_link(section_id, rank=0.25)
+    link3_id = await populator.add_link(section_id, rank=0.375)
+    cache = Cache(FakeRedis(), LocalCache(max_items=100, max_bytes=1000))
+
+    await rebalance_ranks(database, cache)
+
+    links = {link.id: link.rank for link in await populator.list_links()}
+    assert links == {link1_id: 0, link2_id: 1, link3_id: 2}
+    scope_key = get_user_scope_key(authenticated_user.id)
+    tag_keys = [get_tag_key(scope_key, tag) for tag in [CacheTag.SECTIONS, CacheTag.LINKS, GENERATION_TAG]]
+    assert await cache.get_tag_versions(tag_keys) == [0, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_move_link_next_to_a_link_in_the_middle(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    link1_id = await populator.add_link(section_id, rank=0)
+    link2_id = await populator.add_link(section_id, rank=1)
+    link3_id = await populator.add_link(section_id, rank=2)
+
+    result = test_client.query(move_link_query, {"id": link3_id, "afterId": link2_id})
+
+    assert result["data"]["moveLink"]["errors"][0]["msg"] == "The link must be moved next to the first or the last link"
+    assert get_order(await populator.list_links(section_ids={section_id})) == [link1_id, link2_id, link3_id]
+
+
+@pytest.mark.asyncio
+async def test_move_section_without_neighbours(test_client, populator, authenticated_user):
+    section1_id = await populator.add_section(authenticated_user.id, rank=0)
+    await populator.add_section(authenticated_user.id, rank=1)
+
+    result = test_client.query(move_section_query, {"id": section1_id})
+
+    assert result["data"]["moveSection"]["errors"][0]["msg"] == "beforeId or afterId is required"
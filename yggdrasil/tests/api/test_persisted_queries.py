@@ -0,0 +1,75 @@
+from hashlib import sha256
+
+import orjson
+import pytest
+
+from yggdrasil.components.persisted_queries import PersistedQueryStore
+
+ping_query = "query Ping { ping }"
+ping_hash = sha256(ping_query.encode()).hexdigest()
+
+
+def persisted_query_extensions(query_hash: str) -> dict:
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+def test_unknown_hash(cached_test_client):
+    result = cached_test_client.post("/api", json={"extensions": persisted_query_extensions(ping_hash)}).json()
+
+    assert result["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+
+def test_query_registered_on_miss(cached_test_client, fake_redis):
+    extensions = persisted_query_extensions(ping_hash)
+
+    result = cached_test_client.post("/api", json={"query": ping_query, "extensions": extensions}).json()
+    assert result["data"]["ping"] == "pong"
+    assert fake_redis.expiries[PersistedQueryStore.get_key(ping_hash)] == PersistedQueryStore.EXPIRY
+
+    result = cached_test_client.get("/api", params={"extensions": orjson.dumps(extensions).decode()}).json()
+    assert result["data"]["ping"] == "pong"
+
+
+def test_hash_mismatch(cached_test_client):
+    extensions = persisted_query_extensions("0" * 64)
+
+    result = cached_test_client.post("/api", json={"query": ping_query, "extensions": extensions}).json()
+
+    assert result["errors"][0]["extensions"]["code"] == "INVALID_SHA256_HASH"
+
+
+def test_not_supported_without_redis(test_client):
+    result = test_client.post("/api", json={"extensions": persisted_query_extensions(ping_hash)}).json()
+
+    assert result["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_SUPPORTED"
+
+
+def test_invalid_query_not_registered(cached_test_client, fake_redis):
+    query = "query Unknown { unknownField }"
+    query_hash = sha256(query.encode()).hexdigest()
+
+    result = cached_test_client.post(
+        "/api", json={"query": query, "extensions": persisted_query_extensions(query_hash)}
+    ).json()
+
+    assert "errors" in result
+    assert PersistedQueryStore.get_key(query_hash) not in fake_redis.data
+
+
+@pytest.mark.parametrize(
+    "extensions",
+    ["x", {"persistedQuery": 1}, {"persistedQuery": {"version": 1}}, {"persistedQuery": {"sha256Hash": 1}}],
+)
+def test_malformed_extensions(cached_test_client, extensions):
+    result = cached_test_client.post("/api", json={"query": ping_query, "extensions": extensions}).json()
+
+    assert result["errors"][0]["extensions"]["code"] == "BAD_REQUEST"
+
+
+def test_malformed_extensions_do_not_abort_the_batch(cached_test_client):
+    operations = [{"query": ping_query, "extensions": {"persistedQuery": 1}}, {"query": ping_query}]
+
+    result = cached_test_client.post("/api", json=operations).json()
+
+    assert result[0]["errors"][0]["extensions"]["code"] == "BAD_REQUEST"
+    assert result[1] == {"data": {"ping": "pong"}}
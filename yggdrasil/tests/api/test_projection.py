@@ -0,0 +1,51 @@
+import pytest
+
+from yggdrasil.schema import LinkType
+from yggdrasil.tests.tools import capture_statements
+
+
+@pytest.mark.asyncio
+async def test_links_select_the_requested_columns(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    await populator.add_link(section_id, title="first")
+
+    with capture_statements() as statements:
+        result = test_client.query(
+            "query Links($sectionId: Int) { all: links { title } bySection: links(sectionId: $sectionId) { title } }",
+            {"sectionId": section_id},
+        )
+
+    assert result == {"data": {"all": [{"title": "first"}], "bySection": [{"title": "first"}]}}
+    link_statements = [statement for statement in statements if "FROM link" in statement]
+    assert len(link_statements) == 2
+    assert all("link.title" in statement and "favicon" not in statement for statement in link_statements)
+
+
+@pytest.mark.asyncio
+async def test_board_settings_select_the_requested_columns(test_client, authenticated_user):
+    with capture_statements() as statements:
+        result = test_client.query("query BoardSettings { boardSettings { background { type } } }")
+
+    assert "errors" not in result
+    settings_statements = [statement for statement in statements if "board_background_type" in statement]
+    assert len(settings_statements) == 1
+    assert "board_background_value" not in settings_statements[0]
+    assert "email" not in settings_statements[0]
+
+
+@pytest.mark.asyncio
+async def test_board_selects_the_requested_link_columns(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id, name="section")
+    group_id = await populator.add_link(section_id, title="group", type=LinkType.GROUP)
+    await populator.add_link(section_id, title="member", link_group_id=group_id)
+
+    with capture_statements() as statements:
+        result = test_client.query("query Board { board { name links { title links { title } } } }")
+
+    assert result == {
+        "data": {"board": [{"name": "section", "links": [{"title": "group", "links": [{"title": "member"}]}]}]}
+    }
+    board_statements = [statement for statement in statements if "FROM section LEFT OUTER JOIN link" in statement]
+    assert len(board_statements) == 1
+    assert "link.title" in board_statements[0]
+    assert "link.favicon" not in board_statements[0] and "link.url" not in board_statements[0]
@@ -0,0 +1,138 @@
+"""The statements of the nodes are explained against a populated database. The sequential scans are disabled, so the
+planner picks one only when there is no index to use, regardless of the size of the tables."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, text
+
+from yggdrasil.db_tables import user, section, link
+from yggdrasil.schema import LinkType
+from yggdrasil.tests.tools import capture_executions
+
+EXPLAINED_STATEMENTS = ("SELECT", "UPDATE", "DELETE")
+
+
+@pytest_asyncio.fixture()
+async def dataset(db_session):
+    """Other users' boards"""
+    user_ids = (
+        await db_session.scalars(insert(user).returning(user.c.id), [{"sub": f"sub{index}"} for index in range(200)])
+    ).all()
+    section_ids = (
+        await db_session.scalars(
+            insert(section).returning(section.c.id),
+            [{"user_id": user_id, "name": "", "rank": rank} for user_id in user_ids for rank in range(5)],
+        )
+    ).all()
+    await db_session.execute(
+        insert(link),
+        [
+            {"section_id": section_id, "title": "", "url": "", "rank": rank, "type": LinkType.SINGLE.value}
+            for section_id in section_ids
+            for rank in range(10)
+        ],
+    )
+    await db_session.commit()
+    await db_session.execute(text("ANALYZE"))
+
+
+@pytest_asyncio.fixture()
+async def board(dataset, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id, rank=0)
+    other_section_id = await populator.add_section(authenticated_user.id, rank=1)
+    group_id = await populator.add_link(section_id, rank=0, type=LinkType.GROUP)
+    await populator.add_link(section_id, rank=0, link_group_id=group_id)
+    link_ids = [await populator.add_link(section_id, rank=rank) for rank in range(1, 4)]
+    return {"section_id": section_id, "other_section_id": other_section_id, "group_id": group_id, "link_ids": link_ids}
+
+
+async def find_sequential_scans(db_session, executions: list[tuple]) -> list[str]:
+    connection = await db_session.connection()
+    await connection.exec_driver_sql("SET enable_seqscan = off")
+    sequential_scans = []
+    try:
+        for statement, parameters in executions:
+            if not statement.lstrip().startswith(EXPLAINED_STATEMENTS):
+                continue
+            plan = "\n".join(row[0] for row in await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters))
+            if "Seq Scan" in plan:
+                sequential_scans.append(f"{statement}\n{plan}")
+    finally:
+        await connection.exec_driver_sql("RESET enable_seqscan")
+    return sequential_scans
+
+
+operations = {
+    "links": lambda board: ("query Links { links { id title } }", None),
+    "linksBySection": lambda board: (
+        "query Links($sectionId: Int) { links(sectionId: $sectionId) { id title } }",
+        {"sectionId": board["section_id"]},
+    ),
+    "sections": lambda board: ("query Sections { sections { id name } }", None),
+    "board": lambda board: ("query Board { board { name links { title } } }", None),
+    "boardSettings": lambda board: ("query BoardSettings { boardSettings { background { type value } } }", None),
+    "saveSection": lambda board: (
+        "mutation SaveSection($section: SectionInput) { saveSection(section: $section) { errors { msg } } }",
+        {"section": {"id": board["section_id"], "name": "renamed", "rank": 0}},
+    ),
+    "saveLink": lambda board: (
+        "mutation SaveLink($link: LinkInput) { saveLink(link: $link) { errors { msg } } }",
+        {
+            "link": {
+                "id": board["group_id"],
+                "sectionId": board["other_section_id"],
+                "title": "group",
+                "url": "https://google.com",
+                "rank": 0,
+                "type": LinkType.GROUP.value,
+                "favicon": "https://google.com/favicon.ico",
+            }
+        },
+    ),
+    "saveLinksRanks": lambda board: (
+        "mutation SaveLinksRanks($linkIds: [Int!]!) { saveLinksRanks(linkIds: $linkIds) { errors { msg } } }",
+        {"linkIds": board["link_ids"][::-1]},
+    ),
+    "saveSectionsRanks": lambda board: (
+        "mutation SaveSectionsRanks($ids: [Int!]!) { saveSectionsRanks(sectionIds: $ids) { errors { msg } } }",
+        {"ids": [board["other_section_id"], board["section_id"]]},
+    ),
+    "moveLink": lambda board: (
+        "mutation MoveLink($id: Int!, $beforeId: Int) { moveLink(id: $id, beforeId: $beforeId) { errors { msg } } }",
+        {"id": board["link_ids"][0], "beforeId": board["link_ids"][2]},
+    ),
+    "moveSection": lambda board: (
+        "mutation MoveSection($id: Int!, $afterId: Int) { moveSection(id: $id, afterId: $afterId) { errors { msg } } }",
+        {"id": board["other_section_id"], "afterId": board["section_id"]},
+    ),
+    "deleteLink": lambda board: (
+        "mutation DeleteLink($id: Int!) { deleteLink(id: $id) { errors { msg } } }",
+        {"id": board["link_ids"][0]},
+    ),
+    "deleteSection": lambda board: (
+        "mutation DeleteSection($id: Int!) { deleteSection(id: $id) { errors { msg } } }",
+        {"id": board["other_section_id"]},
+    ),
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("operation", operations.keys())
+async def test_operations_use_indexes(test_client, db_session, board, operation):
+    query, variables = operations[operation](board)
+
+    with capture_executions() as executions:
+        result = test_client.query(query, variables)
+
+    assert "errors" not in result
+    assert all(not field.get("errors") for field in result["data"].values() if isinstance(field, dict))
+    assert await find_sequential_scans(db_session, executions) == []
+
+
+@pytest.mark.asyncio
+async def test_login_uses_index(test_client, db_session, dataset):
+    with capture_executions() as executions:
+        async with test_client.authenticate_user():
+            pass
+
+    assert await find_sequential_scans(db_session, executions) == []
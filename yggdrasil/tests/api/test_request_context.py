@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+
+from yggdrasil.components.cache import Cache, LocalCache
+from yggdrasil.components.database import database_sessions
+from yggdrasil.components.request_context import RequestContext
+from yggdrasil.components.request_context_middleware import RequestContextMiddleware, request_database_sessions
+from yggdrasil.components.types import RequestScopeKeys
+
+
+@pytest.mark.asyncio
+async def test_database_session_is_opened_on_demand(test_client, authenticated_user):
+    opened = request_database_sessions.get("opened")
+    avoided = request_database_sessions.get("avoided")
+
+    assert test_client.post("/api/", json={"query": "{ ping }"}).json() == {"data": {"ping": "pong"}}
+    assert request_database_sessions.get("opened") == opened
+    assert request_database_sessions.get("avoided") == avoided + 1
+
+    assert test_client.post("/api/", json={"query": "{ sections { id } }"}).json() == {"data": {"sections": []}}
+    assert request_database_sessions.get("opened") == opened + 1
+
+
+@pytest.mark.asyncio
+async def test_queries_read_from_the_replica(replicated_test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first")
+    replica_sessions = database_sessions.get("replica")
+    primary_sessions = database_sessions.get("primary")
+
+    result = replicated_test_client.post("/api/", json={"query": "{ sections { name } }"}).json()
+
+    assert result == {"data": {"sections": [{"name": "first"}]}}
+    assert database_sessions.get("replica") == replica_sessions + 1
+    assert database_sessions.get("primary") == primary_sessions
+
+
+@pytest.mark.asyncio
+async def test_queries_after_a_mutation_of_the_batch_read_from_the_primary(replicated_test_client, authenticated_user):
+    replica_sessions = database_sessions.get("replica")
+    operations = [
+        {"query": 'mutation { saveSection(section: {name: "first", rank: 0}) { errors { msg } } }'},
+        {"query": "{ sections { name } }"},
+    ]
+
+    result = replicated_test_client.post("/api/", json=operations).json()
+
+    assert result[1] == {"data": {"sections": [{"name": "first"}]}}
+    assert database_sessions.get("replica") == replica_sessions
+
+
+@pytest.mark.asyncio
+async def test_cache_writes_are_flushed_when_the_request_fails(fake_redis):
+    cache = Cache(fake_redis, LocalCache(max_items=100, max_bytes=1000))
+
+    async def app(scope, receive, send):
+        scope[RequestScopeKeys.REQUEST_CACHE].set(cache.encode("key", "data", timedelta(minutes=1)))
+        raise RuntimeError
+
+    middleware = RequestContextMiddleware(app, RequestContext(None, None, None, fake_redis, cache, None))
+    with pytest.raises(RuntimeError):
+        await middleware({"type": "http"}, None, None)
+
+    assert "key" in fake_redis.data
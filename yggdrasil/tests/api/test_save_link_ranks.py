@@ -1,6 +1,7 @@
 import pytest
 
 from yggdrasil.api.types import get_auth_error
+from yggdrasil.tests.tools import capture_statements
 
 query = """
 mutation SaveLinkRank($linkIds: [Int!]!) { 
@@ -40,3 +41,17 @@ async def test_success(test_client, populator, authenticated_user):
 
     link2_rank_result = await populator.list_links(link_ids={link2_id})
     assert link2_rank_result[0].rank == 2
+
+
+@pytest.mark.asyncio
+async def test_ranks_are_saved_with_a_single_statement(test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id)
+    link_ids = [await populator.add_link(section_id, rank=rank) for rank in range(20)]
+
+    with capture_statements() as statements:
+        result = test_client.query(query, {"linkIds": link_ids[::-1]})
+
+    assert result["data"]["saveLinksRanks"]["errors"] == []
+    assert len([statement for statement in statements if statement.startswith("UPDATE")]) == 1
+    links = await populator.list_links(section_ids={section_id})
+    assert [link.id for link in sorted(links, key=lambda link: link.rank)] == link_ids[::-1]
@@ -0,0 +1,161 @@
+import httpx
+import pytest
+
+from yggdrasil.api.events import get_board_channel
+from yggdrasil.components.database import SerializedSession
+from yggdrasil.components.event_bus import EventBus
+from yggdrasil.components.request_context_middleware import request_database_sessions
+
+board_events_subscription = "subscription BoardEvents { boardEvents { type ids section { id name } } }"
+
+save_section_mutation = """
+mutation SaveSection($section: SectionInput!) {
+    saveSection(section: $section) {
+        errors { msg }
+    }
+}
+"""
+
+
+def start_subscription(websocket, query: str):
+    websocket.send_json({"type": "connection_init"})
+    assert websocket.receive_json() == {"type": "connection_ack"}
+    websocket.send_json({"type": "start", "id": "events", "payload": {"query": query}})
+    # the messages are handled in order, so the subscription is active when the ping is answered
+    websocket.send_json({"type": "start", "id": "ping", "payload": {"query": "{ ping }"}})
+    assert websocket.receive_json() == {"type": "data", "id": "ping", "payload": {"data": {"ping": "pong"}}}
+
+
+@pytest.mark.asyncio
+async def test_board_events(cached_test_client, populator, authenticated_user):
+    section_id = await populator.add_section(authenticated_user.id, name="first")
+
+    with cached_test_client.websocket_connect("/api/", subprotocols=["graphql-ws"]) as websocket:
+        start_subscription(websocket, board_events_subscription)
+
+        cached_test_client.query(save_section_mutation, {"section": {"id": section_id, "name": "renamed", "rank": 0}})
+        cached_test_client.query(
+            "mutation DeleteSection($id: Int!) { deleteSection(id: $id) { errors { msg } } }", {"id": section_id}
+        )
+
+        assert websocket.receive_json()["payload"]["data"]["boardEvents"] == {
+            "type": "SECTION_SAVED",
+            "ids": [],
+            "section": {"id": section_id, "name": "renamed"},
+        }
+        assert websocket.receive_json()["payload"]["data"]["boardEvents"] == {
+            "type": "SECTION_DELETED",
+            "ids": [section_id],
+            "section": None,
+        }
+
+
+def test_board_events_need_authentication(cached_test_client):
+    with cached_test_client.websocket_connect("/api/", subprotocols=["graphql-ws"]) as websocket:
+        websocket.send_json({"type": "start", "id": "events", "payload": {"query": board_events_subscription}})
+
+        message = websocket.receive_json()
+
+    assert message["type"] == "error"
+    assert message["payload"]["message"] == "Authentication needed"
+
+
+def test_query_limits_apply_over_websocket(cached_test_client):
+    fields = " ".join(f"ping{index}: ping" for index in range(50))
+
+    with cached_test_client.websocket_connect("/api/", subprotocols=["graphql-ws"]) as websocket:
+        websocket.send_json({"type": "start", "id": "pings", "payload": {"query": f"{{ {fields} }}"}})
+
+        message = websocket.receive_json()
+
+    assert message["type"] == "error"
+    assert message["payload"]["message"] == "Operation aliases 50 exceeds the maximum of 20"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("with_event", [False, True])
+async def test_stopped_subscription_releases_the_connection(
+    cached_test_client, fake_redis, populator, authenticated_user, with_event
+):
+    channel = get_board_channel(authenticated_user.id)
+
+    with cached_test_client.websocket_connect("/api/", subprotocols=["graphql-ws"]) as websocket:
+        start_subscription(websocket, board_events_subscription)
+        assert len(fake_redis.subscribers[channel]) == 1
+
+        if with_event:
+            cached_test_client.query(save_section_mutation, {"section": {"name": "first", "rank": 0}})
+            assert websocket.receive_json()["payload"]["data"]["boardEvents"]["type"] == "SECTION_SAVED"
+
+        websocket.send_json({"type": "stop", "id": "events"})
+        websocket.send_json({"type": "start", "id": "ping", "payload": {"query": "{ ping }"}})
+        # the stopped subscription may complete before or after the ping is answered
+        while websocket.receive_json()["id"] != "ping":
+            pass
+
+        assert fake_redis.subscribers[channel] == []
+
+
+@pytest.mark.asyncio
+async def test_websocket_operations_are_cached_when_done(cached_test_client, fake_redis, authenticated_user):
+    with cached_test_client.websocket_connect("/api/", subprotocols=["graphql-ws"]) as websocket:
+        websocket.send_json({"type": "connection_init"})
+        assert websocket.receive_json() == {"type": "connection_ack"}
+        websocket.send_json({"type": "start", "id": "sections", "payload": {"query": "{ sections { id } }"}})
+        assert websocket.receive_json()["payload"] == {"data": {"sections": []}}
+        # the messages are handled in order, so the sections operation is done when the ping is answered
+        websocket.send_json({"type": "start", "id": "ping", "payload": {"query": "{ ping }"}})
+        while websocket.receive_json()["id"] != "ping":
+            pass
+
+        assert any(key.startswith("SectionsNode:") for key in fake_redis.data)
+
+
+@pytest.mark.asyncio
+async def test_websocket_operations_release_their_database_session(cached_test_client, monkeypatch, authenticated_user):
+    closed_sessions = []
+    close = SerializedSession.close
+
+    async def tracking_close(session):
+        closed_sessions.append(session)
+        await close(session)
+
+    monkeypatch.setattr(SerializedSession, "close", tracking_close)
+    opened = request_database_sessions.get("opened")
+
+    with cached_test_client.websocket_connect("/api/", subprotocols=["graphql-ws"]) as websocket:
+        websocket.send_json({"type": "connection_init"})
+        assert websocket.receive_json() == {"type": "connection_ack"}
+        websocket.send_json({"type": "start", "id": "sections", "payload": {"query": "{ sections { id } }"}})
+        assert websocket.receive_json()["payload"] == {"data": {"sections": []}}
+        websocket.send_json({"type": "start", "id": "ping", "payload": {"query": "{ ping }"}})
+        while websocket.receive_json()["id"] != "ping":
+            pass
+
+        # released while the connection is still open
+        assert len(closed_sessions) == 1
+        assert request_database_sessions.get("opened") == opened + 1
+
+
+@pytest.mark.asyncio
+async def test_subscribers_refetching_on_an_event_get_the_new_data(
+    cached_test_client, monkeypatch, populator, authenticated_user
+):
+    section_id = await populator.add_section(authenticated_user.id, name="first")
+    sections_query = {"query": "{ sections { name } }"}
+    assert cached_test_client.post("/api/", json=sections_query).json() == {"data": {"sections": [{"name": "first"}]}}
+    publish = EventBus.publish
+    refetched = []
+
+    async def refetching_publish(event_bus, channel, event):
+        # a subscriber refetches as soon as the event is received
+        transport = httpx.ASGITransport(app=cached_test_client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            refetched.append((await client.post("/api/", json=sections_query)).json())
+        await publish(event_bus, channel, event)
+
+    monkeypatch.setattr(EventBus, "publish", refetching_publish)
+
+    cached_test_client.query(save_section_mutation, {"section": {"id": section_id, "name": "renamed", "rank": 0}})
+
+    assert refetched == [{"data": {"sections": [{"name": "renamed"}]}}]
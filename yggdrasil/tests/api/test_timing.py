@@ -0,0 +1,17 @@
+import pytest
+
+from yggdrasil.components.graphene.timing import resolver_seconds
+
+
+@pytest.mark.asyncio
+async def test_node_timings_are_recorded(test_client, populator, authenticated_user):
+    await populator.add_section(authenticated_user.id, name="first", rank=0)
+    resolve_count = resolver_seconds.series.get(("BoardNode", "resolve"))
+    resolve_count = resolve_count.count if resolve_count else 0
+
+    result = test_client.query("query Board { board { name } ping }")
+
+    assert result == {"data": {"board": [{"name": "first"}], "ping": "pong"}}
+    assert resolver_seconds.series[("BoardNode", "resolve")].count == resolve_count + 1
+    assert resolver_seconds.series[("BoardNode", "db")].samples[-1] > 0
+    assert resolver_seconds.series[("ping", "resolve")].count > 0
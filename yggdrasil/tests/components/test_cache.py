@@ -0,0 +1,194 @@
+import asyncio
+from datetime import timedelta
+from time import sleep
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from yggdrasil.components.cache import Cache, LocalCache, RequestCache
+from yggdrasil.components.cache_codec import PlainCodec, ZlibCodec
+from yggdrasil.tests.tools import FakeRedis
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_items=2, max_bytes=1000)
+    cache.set("a", 1, 1, timedelta(minutes=1))
+    cache.set("b", 2, 1, timedelta(minutes=1))
+    cache.get("a")
+    cache.set("c", 3, 1, timedelta(minutes=1))
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_local_cache_memory_limit():
+    cache = LocalCache(max_items=100, max_bytes=10)
+    cache.set("a", 1, 6, timedelta(minutes=1))
+    cache.set("b", 2, 6, timedelta(minutes=1))
+    cache.set("huge", 3, 11, timedelta(minutes=1))
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("huge") is None
+    assert cache.size == 6
+
+
+def test_local_cache_expiry():
+    cache = LocalCache(max_items=100, max_bytes=100)
+    cache.set("a", 1, 1, timedelta(milliseconds=10))
+    sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_local_tier_answers_first():
+    redis = FakeRedis()
+    cache = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    await cache.set("key", {"a": 1}, timedelta(minutes=1))
+    redis.data.clear()
+
+    assert (await cache.get("key")).data == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_fills_local():
+    redis = FakeRedis()
+    await Cache(redis, LocalCache(max_items=100, max_bytes=1000)).set("key", [1, 2], timedelta(minutes=1))
+
+    cache = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    assert (await cache.get("key")).data == [1, 2]
+    assert cache.local.get("key").data == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_propagated_between_workers():
+    redis = FakeRedis()
+    worker1 = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    worker2 = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+
+    assert await worker2.get_tag_versions(["tag"]) == [0]
+
+    listener = asyncio.create_task(worker2.listen_for_invalidations())
+    await asyncio.sleep(0)
+    await worker1.invalidate_tags(["tag"])
+    await asyncio.sleep(0)
+    listener.cancel()
+
+    assert await worker2.get_tag_versions(["tag"]) == [1]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_listener_reconnects(monkeypatch):
+    redis = FakeRedis()
+    worker1 = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    worker2 = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    monkeypatch.setattr(Cache, "INVALIDATION_RECONNECT_DELAY", timedelta())
+    create_pubsub = redis.pubsub
+    connections = []
+
+    def connect_pubsub():
+        connections.append(True)
+        if len(connections) == 1:
+            raise ConnectionError("Connection refused")
+        return create_pubsub()
+
+    monkeypatch.setattr(redis, "pubsub", connect_pubsub)
+
+    listener = asyncio.create_task(worker2.listen_for_invalidations())
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert await worker2.get_tag_versions(["tag"]) == [0]
+    await worker1.invalidate_tags(["tag"])
+    await asyncio.sleep(0)
+    listener.cancel()
+
+    assert len(connections) == 2
+    assert await worker2.get_tag_versions(["tag"]) == [1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "raw_data",
+    [b"", bytes([PlainCodec.header]) + b'{"data": ', bytes([ZlibCodec.header]) + b"garbage", b"\x01[1]"],
+    ids=["empty", "truncated", "corrupt", "not an entry"],
+)
+async def test_undecodable_entries_are_misses(raw_data):
+    redis = FakeRedis()
+    cache = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    redis.data["key"] = raw_data
+
+    assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_entry_is_kept_for_stale_time():
+    cache = Cache(FakeRedis(), LocalCache(max_items=100, max_bytes=1000))
+    await cache.set("key", "data", timedelta(), timedelta(minutes=1))
+
+    entry = await cache.get("key")
+    assert entry.data == "data"
+    assert entry.is_stale
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_not_kept_locally():
+    redis = FakeRedis()
+    worker1 = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    worker2 = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    await worker1.set("key", "old", timedelta(milliseconds=10), timedelta(minutes=1))
+    assert (await worker2.get("key")).data == "old"
+
+    await asyncio.sleep(0.02)
+    await worker1.set("key", "new", timedelta(minutes=1))
+
+    assert worker2.local.get("key") is None
+    assert (await worker2.get("key")).data == "new"
+
+
+@pytest.mark.asyncio
+async def test_lock_is_exclusive():
+    redis = FakeRedis()
+    worker1 = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    worker2 = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+
+    async with worker1.lock("key") as acquired1:
+        async with worker2.lock("key") as acquired2:
+            assert acquired1
+            assert not acquired2
+
+    async with worker2.lock("key") as acquired:
+        assert acquired
+
+
+@pytest.mark.asyncio
+async def test_request_cache_batches_lookups():
+    redis = FakeRedis()
+    cache = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    await cache.set("a", 1, timedelta(minutes=1))
+    cache.local.clear()
+    request_cache = RequestCache(cache)
+    executions = redis.pipeline_executions
+
+    entries = await asyncio.gather(request_cache.get("a"), request_cache.get("b"), request_cache.get("a"))
+
+    assert [entry and entry.data for entry in entries] == [1, None, 1]
+    assert redis.pipeline_executions == executions + 1
+
+
+@pytest.mark.asyncio
+async def test_request_cache_flushes_writes_at_once():
+    redis = FakeRedis()
+    cache = Cache(redis, LocalCache(max_items=100, max_bytes=1000))
+    request_cache = RequestCache(cache)
+
+    request_cache.set(cache.encode("a", 1, timedelta(minutes=1)))
+    request_cache.set(cache.encode("b", 2, timedelta(minutes=1)))
+    assert redis.data == {}
+
+    await request_cache.flush()
+
+    assert redis.pipeline_executions == 1
+    assert [entry.data for entry in await cache.get_many(["a", "b"])] == [1, 2]
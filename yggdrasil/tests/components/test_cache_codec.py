@@ -0,0 +1,41 @@
+import pytest
+
+from yggdrasil.components import cache_codec
+from yggdrasil.components.cache_codec import CacheCodecError, PlainCodec, ZlibCodec
+from yggdrasil.schema import Link, LinkType
+
+
+def test_small_payload_is_not_compressed():
+    raw = cache_codec.encode({"a": 1})
+
+    assert raw[0] == PlainCodec.header
+    assert cache_codec.decode(raw) == {"a": 1}
+
+
+def test_large_payload_is_compressed():
+    data = [{"title": "Google", "url": "https://google.com"}] * 100
+    raw = cache_codec.encode(data)
+
+    assert raw[0] == ZlibCodec.header
+    assert cache_codec.decode(raw) == data
+
+
+def test_pydantic_models_are_serialized():
+    link = Link(id=1, title="Google", section_id=2, rank=0, type=LinkType.SINGLE)
+
+    assert cache_codec.decode(cache_codec.encode([link]))[0]["type"] == "SINGLE"
+
+
+def test_unknown_header():
+    with pytest.raises(CacheCodecError):
+        cache_codec.decode(b'{"a": 1}')
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [b"", bytes([PlainCodec.header]) + b'{"a": ', bytes([ZlibCodec.header]) + b"garbage"],
+    ids=["empty", "truncated", "corrupt"],
+)
+def test_invalid_payload(raw):
+    with pytest.raises(CacheCodecError):
+        cache_codec.decode(raw)
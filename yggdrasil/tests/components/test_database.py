@@ -0,0 +1,32 @@
+import pytest
+
+from yggdrasil.components.database import Database, LazySession
+from yggdrasil.tests.tools import FakeRedis
+
+
+def test_reads_go_to_the_replicas(database_url):
+    database = Database(database_url, [database_url, database_url])
+    first, second = LazySession(database), LazySession(database)
+
+    assert first.get().bind is database.engine
+    assert first.get(read_only=True).bind is database.replica_engines[0]
+    assert second.get(read_only=True).bind is database.replica_engines[1]
+
+
+def test_reads_without_replicas_use_the_primary(database_url):
+    database = Database(database_url)
+
+    assert LazySession(database).get(read_only=True).bind is database.engine
+
+
+@pytest.mark.asyncio
+async def test_reads_stay_on_the_primary_after_writes(database_url):
+    database = Database(database_url, [database_url], FakeRedis())
+    await database.mark_recent_writes(1)
+
+    writer_session, other_session = LazySession(database), LazySession(database)
+    await writer_session.route_reads(1)
+    await other_session.route_reads(2)
+
+    assert writer_session.get(read_only=True).bind is database.engine
+    assert other_session.get(read_only=True).bind is database.replica_engines[0]
@@ -0,0 +1,65 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from yggdrasil.components.batch_loader import BatchLoader
+from yggdrasil.components.graphene.dataloader import DataLoader
+
+
+class SquareLoader(DataLoader[int, int]):
+    def __init__(self, info):
+        super().__init__(info)
+        self.batches = []
+
+    async def batch_load(self, keys: list[int]) -> list[int]:
+        self.batches.append(keys)
+        return [key * key for key in keys]
+
+
+def create_info():
+    return SimpleNamespace(context={"request": SimpleNamespace(scope={})})
+
+
+@pytest.mark.asyncio
+async def test_keys_are_loaded_in_one_batch():
+    loader = SquareLoader.get(create_info())
+
+    assert await asyncio.gather(loader.load(2), loader.load(3), loader.load(2)) == [4, 9, 4]
+    assert loader.batches == [[2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_results_are_memoized_for_the_request():
+    info = create_info()
+    await SquareLoader.get(info).load(2)
+
+    loader = SquareLoader.get(info)
+    assert await loader.load_many([2, 4]) == [4, 16]
+    assert loader.batches == [[2], [4]]
+    assert SquareLoader.get(create_info()) is not loader
+
+
+@pytest.mark.asyncio
+async def test_dispatch_is_kept_until_it_is_done():
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def batch_fn(keys: list[int]) -> list[int]:
+        started.set()
+        await release.wait()
+        return keys
+
+    loader = BatchLoader(batch_fn)
+    load = asyncio.ensure_future(loader.load(1))
+    await started.wait()
+
+    assert len(loader._dispatch_tasks) == 1
+    gc.collect()
+    release.set()
+
+    assert await load == 1
+    # the done callbacks run in the next iteration of the loop
+    await asyncio.sleep(0)
+    assert loader._dispatch_tasks == set()
@@ -0,0 +1,35 @@
+import pytest
+
+from yggdrasil.api.schema import create_api_schema
+from yggdrasil.components.document_cache import DocumentCache, DocumentValidationError, document_cache_hits
+
+
+def test_validated_document_is_reused():
+    cache = DocumentCache(create_api_schema().graphql_schema)
+    hits = document_cache_hits.get()
+
+    document = cache.get("{ ping }")
+
+    assert cache.get("{ ping }") is document
+    assert document_cache_hits.get() == hits + 1
+
+
+def test_least_recently_used_document_is_evicted():
+    cache = DocumentCache(create_api_schema().graphql_schema, max_items=2)
+    ping = cache.get("{ ping }")
+    cache.get("{ version }")
+    cache.get("{ ping }")
+    cache.get("{ authClients { name } }")
+
+    assert len(cache) == 2
+    assert cache.get("{ ping }") is ping
+
+
+@pytest.mark.parametrize("query", ["{ ping", "{ unknownField }"])
+def test_invalid_document(query):
+    cache = DocumentCache(create_api_schema().graphql_schema)
+
+    with pytest.raises(DocumentValidationError):
+        cache.get(query)
+
+    assert len(cache) == 0
@@ -2,9 +2,12 @@ from typing import Annotated
 
 import pytest
 from graphene import String, List, NonNull
+from graphql import FragmentDefinitionNode, OperationDefinitionNode, parse
 from pydantic import BaseModel, HttpUrl, StringConstraints
 
+from yggdrasil.components.graphene import pydantic as graphene_pydantic
 from yggdrasil.components.graphene.pydantic import object_type_from_pydantic, clear_type_registry
+from yggdrasil.components.graphene.tools import get_field_name_list
 
 
 def test_generate_httpurl():
@@ -40,3 +43,60 @@ def test_generate_required_in_list():
     messages_field: List = graphene_object.messages
 
     assert type(messages_field.of_type) == NonNull
+
+
+def test_registered_types_are_not_rebuilt(monkeypatch):
+    class Item(BaseModel):
+        title: str
+
+    class Example(BaseModel):
+        items: list[Item]
+
+    clear_type_registry()
+    built_models = []
+    create_class_property_dict = graphene_pydantic.create_class_property_dict
+
+    def tracking_create_class_property_dict(model, *args):
+        built_models.append(model)
+        return create_class_property_dict(model, *args)
+
+    monkeypatch.setattr(graphene_pydantic, "create_class_property_dict", tracking_create_class_property_dict)
+
+    graphene_object = object_type_from_pydantic(Example)
+
+    assert object_type_from_pydantic(Example) is graphene_object
+    assert object_type_from_pydantic(Item) is graphene_object.items.of_type.of_type
+    assert built_models == [Example, Item]
+
+
+def _get_root_field_names(query: str, variables: dict = None) -> list[str]:
+    document = parse(query)
+    operation = next(d for d in document.definitions if isinstance(d, OperationDefinitionNode))
+    fragments = {d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)}
+    return sorted(get_field_name_list(operation.selection_set.selections[0], fragments, variables))
+
+
+def test_field_names_resolve_fragments_and_aliases():
+    plain = _get_root_field_names("query { links { id linkTitle: title sectionId } }")
+    with_fragments = _get_root_field_names(
+        """
+        query { links { ...LinkFields ... on Link { sectionId } } }
+        fragment LinkFields on Link { title id }
+        """
+    )
+
+    assert plain == with_fragments == ["links.id", "links.section_id", "links.title"]
+
+
+def test_field_names_apply_directives():
+    query = "query Links($full: Boolean!) { links { id title @include(if: $full) } }"
+
+    assert _get_root_field_names(query, {"full": False}) == ["links.id"]
+    assert _get_root_field_names(query, {"full": True}) == ["links.id", "links.title"]
+
+
+def test_field_names_ignore_meta_fields():
+    plain = _get_root_field_names("query { board { background { type } } }")
+    with_typename = _get_root_field_names("query { board { __typename background { type __typename } } }")
+
+    assert plain == with_typename == ["board.background.type"]
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+import orjson
+
+from yggdrasil.components.json_response import dumps, has_long_list, iter_json
+from yggdrasil.schema import Link, LinkType
+
+
+def test_dumps_enums_datetimes_and_models():
+    link = Link(id=1, title="title", section_id=2, rank=0, type=LinkType.SINGLE)
+
+    assert orjson.loads(dumps({"type": LinkType.GROUP, "at": datetime(2024, 1, 2, 3, 4), "link": link})) == {
+        "type": "GROUP",
+        "at": "2024-01-02T03:04:00",
+        "link": link.model_dump(mode="json"),
+    }
+
+
+def test_streamed_json_is_the_same_document():
+    content = {"data": {"links": [{"id": index, "title": f"link {index}"} for index in range(1000)], "ping": "pong"}}
+
+    chunks = list(iter_json(content, min_items=100, chunk_size=4096))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks) == dumps(content)
+
+
+def test_has_long_list():
+    assert has_long_list({"links": [1, 2, 3]}, 3)
+    assert not has_long_list({"links": [1, 2], "ping": "pong"}, 3)
+    assert not has_long_list(None, 3)
@@ -0,0 +1,50 @@
+from yggdrasil.components.metrics import MetricsRegistry
+
+
+def test_counter_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits", ("node",))
+    counter.inc("SectionsNode")
+    counter.inc("SectionsNode", amount=2)
+
+    assert registry.render().splitlines() == [
+        "# HELP yggdrasil_hits_total Hits",
+        "# TYPE yggdrasil_hits_total counter",
+        'yggdrasil_hits_total{node="SectionsNode"} 3',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("size_bytes", "Size", buckets=(10, 100))
+    histogram.observe(5)
+    histogram.observe(50)
+    histogram.observe(500)
+
+    lines = registry.render().splitlines()
+
+    assert 'yggdrasil_size_bytes_bucket{le="10"} 1' in lines
+    assert 'yggdrasil_size_bytes_bucket{le="100"} 2' in lines
+    assert 'yggdrasil_size_bytes_bucket{le="+Inf"} 3' in lines
+    assert "yggdrasil_size_bytes_count 3" in lines
+    assert "yggdrasil_size_bytes_sum 555" in lines
+
+
+def test_same_metric_is_registered_once():
+    registry = MetricsRegistry()
+
+    assert registry.counter("hits_total", "Hits") is registry.counter("hits_total", "Hits")
+
+
+def test_summary_keeps_the_last_observations():
+    registry = MetricsRegistry()
+    summary = registry.summary("resolve_seconds", "Resolve", ("node",))
+    summary.window = 100
+    for value in range(200):
+        summary.observe(value, "BoardNode")
+
+    lines = registry.render().splitlines()
+
+    assert 'yggdrasil_resolve_seconds{node="BoardNode",quantile="0.5"} 150' in lines
+    assert 'yggdrasil_resolve_seconds{node="BoardNode",quantile="0.99"} 199' in lines
+    assert 'yggdrasil_resolve_seconds_count{node="BoardNode"} 200' in lines
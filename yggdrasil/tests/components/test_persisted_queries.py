@@ -0,0 +1,16 @@
+from yggdrasil.components.persisted_queries import get_client_documents
+
+
+def test_client_documents_are_split_per_operation():
+    documents = get_client_documents(
+        """
+        query Sections { sections { ...SectionFields } }
+        fragment SectionFields on Section { id name }
+        mutation DeleteLink($id: Int!) { deleteLink(id: $id) { errors { msg } } }
+        """
+    )
+
+    assert list(documents) == ["Sections", "DeleteLink"]
+    assert "fragment SectionFields on Section {\n  id\n  name\n  __typename\n}" in documents["Sections"]
+    assert "fragment" not in documents["DeleteLink"]
+    assert "errors {\n      msg\n      __typename\n    }\n    __typename" in documents["DeleteLink"]
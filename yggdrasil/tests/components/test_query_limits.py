@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from graphql import (
+    GraphQLField,
+    GraphQLList,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLString,
+    get_introspection_query,
+    parse,
+    specified_rules,
+    validate,
+)
+
+from yggdrasil.api.schema import create_api_schema
+from yggdrasil.components.app_config import QueryLimitsConfig
+from yggdrasil.components.graphene.query_limits import LIST_FAN_OUT, create_query_limits_rule
+
+
+def get_errors(query: str, schema: GraphQLSchema = None, **limits) -> list[str]:
+    rule = create_query_limits_rule(QueryLimitsConfig(**limits))
+    errors = validate(schema or create_api_schema().graphql_schema, parse(query), [*specified_rules, rule])
+    return [error.message for error in errors]
+
+
+def test_operation_within_limits():
+    assert get_errors("{ sections { id } links { id } boardSettings { background { type } } }") == []
+
+
+def test_depth_limit():
+    query = "{ board { links { links { title } } } }"
+    assert get_errors(query, max_depth=3) == ["Operation depth 4 exceeds the maximum of 3"]
+
+
+def test_alias_limit():
+    fields = " ".join(f"links{index}: links(sectionId: {index}) {{ id }}" for index in range(5))
+    assert "Operation aliases 5 exceeds the maximum of 4" in get_errors(f"{{ {fields} }}", max_aliases=4)
+
+
+def test_cost_counts_the_fields_of_fragments():
+    query = "{ ...Board sections { id } } fragment Board on Query { links { id } board { id } ping }"
+    assert get_errors(query, max_cost=8) == ["Operation cost 9 exceeds the maximum of 8"]
+
+
+def test_cost_limit():
+    fields = " ".join(f"images{index}: earthPornImages {{ url }}" for index in range(6))
+    assert get_errors(f"{{ {fields} }}") == ["Operation cost 60 exceeds the maximum of 50"]
+
+
+class _DetailNode:
+    config = SimpleNamespace(cost=3)
+
+    @classmethod
+    def _resolve(cls, root, info):
+        pass
+
+
+def test_cost_of_the_nodes_in_lists_is_multiplied():
+    item_type = GraphQLObjectType("Item", {"detail": GraphQLField(GraphQLString, resolve=_DetailNode._resolve)})
+    schema = GraphQLSchema(GraphQLObjectType("Query", {"items": GraphQLField(GraphQLList(item_type))}))
+
+    cost = 3 * LIST_FAN_OUT
+    assert get_errors("{ items { detail } }", schema, max_cost=cost) == []
+    assert get_errors("{ items { detail } }", schema, max_cost=cost - 1) == [
+        f"Operation cost {cost} exceeds the maximum of {cost - 1}"
+    ]
+
+
+def test_introspection_is_free():
+    assert get_errors(get_introspection_query(), max_depth=1, max_cost=0) == []
@@ -0,0 +1,18 @@
+from yggdrasil.components.ranking import get_rank_between
+
+
+def test_rank_of_the_only_item():
+    assert get_rank_between(None, None) == 0
+
+
+def test_rank_at_the_ends():
+    assert get_rank_between(None, 3) == 2
+    assert get_rank_between(3, None) == 4
+
+
+def test_rank_between_two_items():
+    assert get_rank_between(1, 2) == 1.5
+
+
+def test_no_rank_between_too_close_items():
+    assert get_rank_between(1, 1 + 1e-12) is None
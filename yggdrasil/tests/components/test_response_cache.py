@@ -0,0 +1,35 @@
+import importlib.metadata
+
+import pytest
+
+from yggdrasil.api.schema import create_api_schema
+from yggdrasil.components.cache import Cache, LocalCache
+from yggdrasil.components.response_cache import get_operation_digest, get_response_version
+from yggdrasil.tests.tools import FakeRedis
+
+
+def test_response_version_changes_with_the_release(monkeypatch):
+    schema = create_api_schema().graphql_schema
+    monkeypatch.setattr(importlib.metadata, "version", lambda name: "1.0.0")
+    version = get_response_version(schema)
+    monkeypatch.setattr(importlib.metadata, "version", lambda name: "1.0.1")
+
+    assert get_response_version(schema) != version
+
+
+def test_response_version_changes_with_the_schema():
+    schema = create_api_schema()
+    changed_schema = create_api_schema()
+    changed_schema.graphql_schema.query_type.fields.pop("ping")
+
+    assert get_response_version(schema.graphql_schema) != get_response_version(changed_schema.graphql_schema)
+
+
+@pytest.mark.asyncio
+async def test_operation_digest_changes_with_the_response_version():
+    cache = Cache(FakeRedis(), LocalCache(max_items=100, max_bytes=1000))
+    operation = {"query": "{ sections { id } }"}
+
+    assert await get_operation_digest(cache, operation, 1, "old") != await get_operation_digest(
+        cache, operation, 1, "new"
+    )
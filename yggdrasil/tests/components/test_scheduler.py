@@ -0,0 +1,108 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from yggdrasil.components.scheduler import Scheduler
+from yggdrasil.tests.tools import FakeRedis
+
+
+@pytest.mark.asyncio
+async def test_only_the_leader_runs_jobs():
+    redis = FakeRedis()
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    leader = Scheduler(redis)
+    follower = Scheduler(redis)
+    for scheduler in [leader, follower]:
+        scheduler.add_job("job", job, timedelta(hours=1))
+
+    await leader.tick()
+    await follower.tick()
+
+    assert leader.is_leader
+    assert not follower.is_leader
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_job_is_not_run_before_its_interval():
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    scheduler = Scheduler(None)
+    scheduler.add_job("job", job, timedelta(hours=1))
+
+    await scheduler.tick()
+    await scheduler.tick()
+
+    assert len(calls) == 1
+    assert scheduler.jobs[0].status.runs == 1
+
+
+@pytest.mark.asyncio
+async def test_job_failure_is_reported():
+    async def job():
+        raise ValueError("reddit is down")
+
+    scheduler = Scheduler(None)
+    scheduler.add_job("job", job, timedelta(hours=1))
+
+    await scheduler.tick()
+
+    status = scheduler.jobs[0].status
+    assert status.failures == 1
+    assert status.last_error == "reddit is down"
+    assert status.next_run is not None
+
+
+@pytest.mark.asyncio
+async def test_leadership_is_renewed_while_a_job_runs(monkeypatch):
+    redis = FakeRedis()
+    renewals = []
+    expire = redis.expire
+
+    async def tracking_expire(key, time):
+        renewals.append(key)
+        return await expire(key, time)
+
+    monkeypatch.setattr(redis, "expire", tracking_expire)
+
+    async def job():
+        await asyncio.sleep(0.1)
+
+    scheduler = Scheduler(redis, leader_lock_timeout=timedelta(milliseconds=30))
+    scheduler.add_job("job", job, timedelta(hours=1))
+
+    await scheduler.tick()
+
+    assert scheduler.jobs[0].status.runs == 1
+    assert renewals and set(renewals) == {Scheduler.LEADER_KEY}
+
+
+@pytest.mark.asyncio
+async def test_new_leader_continues_the_schedule():
+    redis = FakeRedis()
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    leader = Scheduler(redis)
+    new_leader = Scheduler(redis)
+    for scheduler in [leader, new_leader]:
+        scheduler.add_job("job", job, timedelta(hours=1))
+
+    await leader.tick()
+    # the leader is gone, its lock expired
+    del redis.data[Scheduler.LEADER_KEY]
+    await new_leader.tick()
+
+    assert new_leader.is_leader
+    assert len(calls) == 1
+    assert new_leader.jobs[0].status.next_run == leader.jobs[0].status.next_run
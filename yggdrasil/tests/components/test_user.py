@@ -1,8 +1,10 @@
 import pytest
 from sqlalchemy import select
 
+from yggdrasil.components.cache import Cache, GENERATION_TAG, LocalCache, get_tag_key, get_user_scope_key
 from yggdrasil.components.user_info import UserInfo
 from yggdrasil.db_tables import user
+from yggdrasil.tests.tools import FakeRedis
 
 
 @pytest.mark.asyncio
@@ -42,3 +44,24 @@ async def test_update_user(db_session):
 
     assert len(users) == 1
     assert users[0].email == "email2"
+
+
+@pytest.mark.asyncio
+async def test_update_user_invalidates_their_cache(db_session):
+    cache = Cache(FakeRedis(), LocalCache(max_items=100, max_bytes=1000))
+    user_info = UserInfo(
+        sub="sub",
+        email="email",
+        given_name="given_name",
+        family_name="family_name",
+        picture="picture",
+    )
+
+    await user_info.store(db_session, cache)
+    generation_key = get_tag_key(get_user_scope_key(user_info.id), GENERATION_TAG)
+    assert await cache.get_tag_versions([generation_key]) == [0]
+
+    user_info.picture = "picture2"
+    await user_info.store(db_session, cache)
+
+    assert await cache.get_tag_versions([generation_key]) == [1]
@@ -7,12 +7,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from testing.postgresql import Postgresql
 
 from yggdrasil.app import get_app
-from yggdrasil.components.app_config import AppConfig
+from yggdrasil.components.app_config import (
+    AppConfig,
+    DatabaseReplicasConfig,
+    ResponseCacheConfig,
+    ResponseStreamingConfig,
+)
 from yggdrasil.components.database import Database
 from yggdrasil.components.user_info import UserInfo
 from yggdrasil.db_tables import meta
 from yggdrasil.tests.populator import Populator
-from yggdrasil.tests.tools import get_fake_session_middleware, YggdarsilTestClient
+from yggdrasil.tests.tools import get_fake_session_middleware, YggdarsilTestClient, FakeRedis
 
 
 @pytest_asyncio.fixture()
@@ -69,6 +74,45 @@ def test_client(app_config, fake_session_data, db_session):
     return client
 
 
+@pytest.fixture()
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture()
+def cached_test_client(app_config, fake_session_data, db_session, fake_redis):
+    session_middleware = get_fake_session_middleware(fake_session_data)
+    app = get_app(config=app_config, session_middleware=session_middleware, redis_client_factory=lambda url: fake_redis)
+    with YggdarsilTestClient(app, db_session, fake_session_data) as client:
+        yield client
+
+
+@pytest.fixture()
+def response_cached_test_client(app_config, fake_session_data, db_session, fake_redis):
+    config = app_config.model_copy(update={"response_cache": ResponseCacheConfig(enabled=True)})
+    session_middleware = get_fake_session_middleware(fake_session_data)
+    app = get_app(config=config, session_middleware=session_middleware, redis_client_factory=lambda url: fake_redis)
+    with YggdarsilTestClient(app, db_session, fake_session_data) as client:
+        yield client
+
+
+@pytest.fixture()
+def streaming_test_client(app_config, fake_session_data, db_session):
+    config = app_config.model_copy(update={"response_streaming": ResponseStreamingConfig(enabled=True, min_items=2)})
+    session_middleware = get_fake_session_middleware(fake_session_data)
+    app = get_app(config=config, session_middleware=session_middleware, redis_client_factory=create_fake_redis)
+    return YggdarsilTestClient(app, db_session, fake_session_data)
+
+
+@pytest.fixture()
+def replicated_test_client(app_config, fake_session_data, db_session):
+    """The replica is the primary database itself, the routing is checked with the database_sessions metric"""
+    config = app_config.model_copy(update={"database_replicas": DatabaseReplicasConfig(urls=[app_config.database_url])})
+    session_middleware = get_fake_session_middleware(fake_session_data)
+    app = get_app(config=config, session_middleware=session_middleware, redis_client_factory=create_fake_redis)
+    return YggdarsilTestClient(app, db_session, fake_session_data)
+
+
 @pytest_asyncio.fixture()
 async def authenticated_user(test_client) -> UserInfo:
     async with test_client.authenticate_user() as user:
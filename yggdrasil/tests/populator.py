@@ -13,7 +13,7 @@ class Populator:
     async def add_user(self, user: UserInfo):
         await user.store(self.db_session)
 
-    async def add_section(self, user_id: int, name: str = "", rank: int = 0) -> int:
+    async def add_section(self, user_id: int, name: str = "", rank: float = 0) -> int:
         query = insert(section).values({"user_id": user_id, "name": name, "rank": rank}).returning(section.c.id)
 
         result = await self.db_session.execute(query)
@@ -26,7 +26,7 @@ class Populator:
         section_id: int,
         title: str = "Google",
         url: str = "https://google.com",
-        rank: int = 0,
+        rank: float = 0,
         type: LinkType = LinkType.SINGLE,
         link_group_id: int = None,
     ) -> int:
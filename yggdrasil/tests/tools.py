@@ -1,6 +1,10 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from datetime import timedelta
 from uuid import uuid4
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.testclient import TestClient
 from starlette.types import ASGIApp, Scope, Receive, Send
@@ -21,6 +25,158 @@ def get_fake_session_middleware(session_data: dict):
     return FakeSessionMiddleware
 
 
+@contextmanager
+def capture_statements():
+    """Collect the SQL statements executed by any engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def capture_executions():
+    """Collect the SQL statements executed by any engine, with their parameters"""
+    executions = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        executions.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield executions
+    finally:
+        event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+
+class FakeRedisPipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name: str):
+        def command(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return command
+
+    async def execute(self) -> list:
+        self._redis.pipeline_executions += 1
+        return [await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._queue = asyncio.Queue()
+
+    async def subscribe(self, *channels: str):
+        for channel in channels:
+            self._redis.subscribers.setdefault(channel, []).append(self._queue)
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float | None = 0.0):
+        return await self._queue.get()
+
+    async def aclose(self):
+        for queues in self._redis.subscribers.values():
+            if self._queue in queues:
+                queues.remove(self._queue)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+
+class FakeLock:
+    def __init__(self, redis: "FakeRedis", name: str):
+        self._redis = redis
+        self._name = name
+
+    async def acquire(self) -> bool:
+        if self._name in self._redis.data:
+            return False
+        self._redis.data[self._name] = b"1"
+        return True
+
+    async def release(self):
+        self._redis.data.pop(self._name, None)
+
+
+class FakeRedis:
+    """Dict based stand-in for the few redis commands the app uses"""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.expiries: dict[str, int | timedelta] = {}
+        self.subscribers: dict[str, list[asyncio.Queue]] = {}
+        self.pipeline_executions = 0
+        self.mget_calls = 0
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        self.mget_calls += 1
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key: str, value, ex: int | timedelta = None, nx: bool = False) -> bool:
+        if nx and key in self.data:
+            return False
+        self.data[key] = self._encode(value)
+        if ex is not None:
+            self.expiries[key] = ex
+        return True
+
+    async def expire(self, key: str, time: int | timedelta) -> bool:
+        return key in self.data
+
+    async def incr(self, key: str) -> int:
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = self._encode(value)
+        return value
+
+    async def pttl(self, key: str) -> int:
+        return 60000 if key in self.data else -2
+
+    async def publish(self, channel: str, message) -> int:
+        queues = self.subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(queues)
+
+    def pipeline(self, transaction: bool = True) -> FakeRedisPipeline:
+        return FakeRedisPipeline(self)
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    def lock(self, name: str, **kwargs) -> FakeLock:
+        return FakeLock(self, name)
+
+
 class YggdarsilTestClient(TestClient):
     def __init__(self, app: ASGIApp, db_session: AsyncSession, fake_session_data: dict):
         super().__init__(app)